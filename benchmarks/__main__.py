@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import typing as t
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import runner
+
+
+def _format_value(metric: str, value: float) -> str:
+    if metric == 'peak_memory':
+        return '{:.1f} KiB'.format(value / 1024)
+    return '{:.3f} ms'.format(value * 1000)
+
+
+def _print_results(result: runner.Result) -> None:
+    print('revision {} python {}'.format(result['revision'], result['python']))
+    for name, values in result['results'].items():
+        if 'error' in values:
+            print('{:<50} {}'.format(name, values['error']))
+        else:
+            print(
+                '{:<50} {:>14} {:>14} {:>14}'.format(
+                    name,
+                    _format_value('min', values['min']),
+                    _format_value('median', values['median']),
+                    _format_value('peak_memory', values['peak_memory']),
+                )
+            )
+
+
+def _print_comparison(base: runner.Result, head: runner.Result, args: argparse.Namespace) -> int:
+    comparisons, regressions = runner.compare(base, head, args.threshold, args.memory_threshold)
+    print('base {} -> head {}'.format(base['revision'], head['revision']))
+    flagged = set(regressions)
+    for comparison in comparisons:
+        if comparison.error is not None:
+            print('{:<50} {:<12} {}  REGRESSION'.format(comparison.name, comparison.metric, comparison.error))
+            continue
+        print(
+            '{:<50} {:<12} {:>14} {:>14} {:>8.2f}x{}'.format(
+                comparison.name,
+                comparison.metric,
+                _format_value(comparison.metric, comparison.base),
+                _format_value(comparison.metric, comparison.head),
+                comparison.ratio,
+                '  REGRESSION' if comparison in flagged else '',
+            )
+        )
+    print('{} regression(s)'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+def _load(path: str) -> runner.Result:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _run_at_revision(revision: str, args: argparse.Namespace) -> runner.Result:
+    root = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel'],
+        capture_output = True,
+        text = True,
+        check = True,
+    ).stdout.strip()
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = os.path.join(directory, 'worktree')
+        suite = os.path.join(directory, 'suite')
+        output = os.path.join(directory, 'result.json')
+        subprocess.run(['git', 'worktree', 'add', '--detach', worktree, revision], cwd = root, check = True)
+        try:
+            shutil.copytree(os.path.dirname(os.path.abspath(__file__)), os.path.join(suite, 'benchmarks'))
+            command = [sys.executable, '-m', 'benchmarks', 'run', '-o', output, '-r', str(args.repeat)]
+            for pattern in args.filter:
+                command.extend(('-k', pattern))
+            subprocess.run(
+                command,
+                cwd = suite,
+                env = dict(os.environ, PYTHONPATH = worktree),
+                check = True,
+                stdout = subprocess.DEVNULL,
+            )
+            return _load(output)
+        finally:
+            subprocess.run(['git', 'worktree', 'remove', '--force', worktree], cwd = root, check = True)
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog = 'python -m benchmarks')
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+
+    run_parser = subparsers.add_parser('run', help = 'run the suite against the importable yeetlong')
+    run_parser.add_argument('-o', '--output', help = 'write results as json to this path')
+
+    compare_parser = subparsers.add_parser('compare', help = 'compare two result files')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+
+    revisions_parser = subparsers.add_parser('compare-revisions', help = 'run the suite at two git revisions')
+    revisions_parser.add_argument('base')
+    revisions_parser.add_argument('head', nargs = '?', default = 'HEAD')
+
+    for sub_parser in (run_parser, revisions_parser):
+        sub_parser.add_argument('-k', '--filter', action = 'append', default = [], help = 'glob over case names')
+        sub_parser.add_argument('-r', '--repeat', type = int, default = 5)
+
+    for sub_parser in (compare_parser, revisions_parser):
+        sub_parser.add_argument('--threshold', type = float, default = .1, help = 'allowed relative slowdown')
+        sub_parser.add_argument('--memory-threshold', type = float, default = .1, help = 'allowed relative peak growth')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        result = runner.run(args.filter or ('*',), args.repeat)
+        _print_results(result)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent = 2)
+        return 0
+
+    if args.command == 'compare':
+        return _print_comparison(_load(args.base), _load(args.head), args)
+
+    return _print_comparison(_run_at_revision(args.base, args), _run_at_revision(args.head, args), args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
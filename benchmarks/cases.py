@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import typing as t
+import threading
+
+from benchmarks import datasets
+
+
+Thunk = t.Callable[[], t.Any]
+CaseFactory = t.Callable[[str], Thunk]
+
+CASES: t.Dict[str, t.Callable[[], Thunk]] = {}
+
+
+def case(name: str, sizes: t.Sequence[str] = datasets.SIZES) -> t.Callable[[CaseFactory], CaseFactory]:
+    def decorator(factory: CaseFactory) -> CaseFactory:
+        for size in sizes:
+            CASES['{}[{}]'.format(name, size)] = lambda _size=size: factory(_size)
+        return factory
+
+    return decorator
+
+
+def _multisets(size: str, cls_name: str = 'Multiset'):
+    from yeetlong import multiset
+
+    cls = getattr(multiset, cls_name)
+    return [(cls(a), cls(b)) for a, b in datasets.count_map_pairs(size)]
+
+
+@case('multiset.construct.mapping')
+def construct_mapping(size: str) -> Thunk:
+    from yeetlong.multiset import Multiset
+
+    count_maps = datasets.count_maps(size)
+    return lambda: [Multiset(count_map) for count_map in count_maps]
+
+
+@case('multiset.construct.elements')
+def construct_elements(size: str) -> Thunk:
+    from yeetlong.multiset import Multiset
+
+    element_lists = list(map(datasets.expanded, datasets.count_maps(size)))
+    return lambda: [Multiset(elements) for elements in element_lists]
+
+
+@case('multiset.construct.ordered')
+def construct_ordered(size: str) -> Thunk:
+    from yeetlong.multiset import OrderedMultiset
+
+    element_lists = list(map(datasets.expanded, datasets.count_maps(size)))
+    return lambda: [OrderedMultiset(elements) for elements in element_lists]
+
+
+@case('multiset.iterate')
+def iterate(size: str) -> Thunk:
+    multisets = [a for a, _ in _multisets(size)]
+    return lambda: [sum(1 for _ in multiset) for multiset in multisets]
+
+
+@case('multiset.len')
+def length(size: str) -> Thunk:
+    multisets = [a for a, _ in _multisets(size)]
+    return lambda: [len(multiset) for multiset in multisets]
+
+
+def _binary_case(name: str, operation: t.Callable[[t.Any, t.Any], t.Any], cls_name: str = 'Multiset') -> None:
+    @case(name)
+    def factory(size: str) -> Thunk:
+        pairs = _multisets(size, cls_name)
+        return lambda: [operation(a, b) for a, b in pairs]
+
+
+for _name, _operation in (
+    ('combine', lambda a, b: a + b),
+    ('union', lambda a, b: a | b),
+    ('intersection', lambda a, b: a & b),
+    ('difference', lambda a, b: a - b),
+    ('symmetric_difference', lambda a, b: a ^ b),
+    ('times', lambda a, b: a * 3),
+    ('issubset', lambda a, b: a <= b),
+    ('issuperset', lambda a, b: a >= b),
+    ('isdisjoint', lambda a, b: a.isdisjoint(b)),
+    ('eq', lambda a, b: a == b),
+):
+    _binary_case('multiset.{}'.format(_name), _operation)
+    _binary_case('frozen_multiset.{}'.format(_name), _operation, 'FrozenMultiset')
+
+
+def _mutating_case(name: str, operation: t.Callable[[t.Any, t.Any], t.Any]) -> None:
+    @case(name)
+    def factory(size: str) -> Thunk:
+        from yeetlong.multiset import Multiset
+
+        pairs = [(Multiset(a), Multiset(b)) for a, b in datasets.count_map_pairs(size)]
+        return lambda: [operation(a, b) for a, b in pairs]
+
+
+for _name, _operation in (
+    ('update', lambda a, b: a.update(b)),
+    ('union_update', lambda a, b: a.union_update(b)),
+    ('intersection_update', lambda a, b: a.intersection_update(b)),
+    ('difference_update', lambda a, b: a.difference_update(b)),
+):
+    _mutating_case('multiset.{}'.format(_name), _operation)
+
+
+@case('multiset.pipeline.eager')
+def pipeline_eager(size: str) -> Thunk:
+    multisets = _multisets(size)
+    return lambda: [(a + b + a) & b - a for a, b in multisets]
+
+
+@case('multiset.pipeline.lazy')
+def pipeline_lazy(size: str) -> Thunk:
+    from yeetlong.lazy import lazy
+
+    multisets = _multisets(size)
+    return lambda: [((lazy(a) + b + a) & (lazy(b) - a)).materialize() for a, b in multisets]
+
+
+@case('frozen_multiset.hash')
+def frozen_multiset_hash(size: str) -> Thunk:
+    from yeetlong.multiset import FrozenMultiset
+
+    multisets = [FrozenMultiset(count_map) for count_map in datasets.count_maps(size)]
+    return lambda: [hash(multiset) for multiset in multisets]
+
+
+@case('frozen_multiset.fingerprint')
+def frozen_multiset_fingerprint(size: str) -> Thunk:
+    from yeetlong.multiset import FrozenMultiset
+
+    multisets = [FrozenMultiset(count_map) for count_map in datasets.count_maps(size)]
+    return lambda: [multiset.fingerprint() for multiset in multisets]
+
+
+@case('combinatorics.hands.combinations', sizes=('deck',))
+def hands_combinations(size: str) -> Thunk:
+    import itertools
+    from yeetlong.multiset import FrozenMultiset
+
+    deck = FrozenMultiset(datasets.count_maps(size)[0])
+    return lambda: set(map(FrozenMultiset, itertools.combinations(deck, 3)))
+
+
+@case('combinatorics.hands.sub_multisets', sizes=('deck',))
+def hands_sub_multisets(size: str) -> Thunk:
+    from yeetlong.combinatorics import sub_multisets
+
+    deck = datasets.count_maps(size)[0]
+    return lambda: list(sub_multisets(deck, 3))
+
+
+@case('operation_cache.intersection')
+def operation_cache_intersection(size: str) -> Thunk:
+    from yeetlong.opcache import OperationCache
+
+    pairs = _multisets(size, 'FrozenMultiset')
+    cache = OperationCache(maxsize = len(pairs))
+    for a, b in pairs:
+        cache.intersection(a, b)
+    return lambda: [cache.intersection(a, b) for a, b in pairs]
+
+
+@case('multiset.freeze.copy')
+def freeze_copy(size: str) -> Thunk:
+    from yeetlong.multiset import FrozenMultiset
+
+    multisets = [a for a, _ in _multisets(size)]
+    return lambda: [FrozenMultiset(multiset) for multiset in multisets]
+
+
+@case('multiset.freeze.snapshot')
+def freeze_snapshot(size: str) -> Thunk:
+    multisets = [a for a, _ in _multisets(size)]
+    return lambda: [multiset.snapshot() for multiset in multisets]
+
+
+@case('multiset_index.subsets.scan', sizes=('deck',))
+def index_subsets_scan(size: str) -> Thunk:
+    from yeetlong.multiset import FrozenMultiset
+
+    decks = [FrozenMultiset(count_map) for count_map in datasets.count_maps(size)]
+    probes = [FrozenMultiset(count_map) for count_map in datasets.count_maps('collection')]
+    return lambda: [[deck for deck in decks if deck <= probe] for probe in probes]
+
+
+@case('multiset_index.subsets.index', sizes=('deck',))
+def index_subsets_index(size: str) -> Thunk:
+    from yeetlong.index import MultisetIndex
+    from yeetlong.multiset import FrozenMultiset
+
+    index = MultisetIndex(map(FrozenMultiset, datasets.count_maps(size)))
+    probes = [FrozenMultiset(count_map) for count_map in datasets.count_maps('collection')]
+    return lambda: [index.subsets(probe) for probe in probes]
+
+
+def _counters(size: str, cls_name: str = 'Counter'):
+    from yeetlong import counters
+
+    cls = getattr(counters, cls_name)
+    return list(
+        zip(
+            map(cls, datasets.signed_count_maps(size, 0)),
+            map(cls, datasets.signed_count_maps(size, 1)),
+        )
+    )
+
+
+@case('counter.construct')
+def counter_construct(size: str) -> Thunk:
+    from yeetlong.counters import Counter
+
+    count_maps = datasets.signed_count_maps(size)
+    return lambda: [Counter(count_map) for count_map in count_maps]
+
+
+def _counter_case(name: str, operation: t.Callable[[t.Any, t.Any], t.Any]) -> None:
+    @case(name)
+    def factory(size: str) -> Thunk:
+        pairs = _counters(size)
+        return lambda: [operation(a, b) for a, b in pairs]
+
+
+for _name, _operation in (
+    ('combine', lambda a, b: a + b),
+    ('difference', lambda a, b: a - b),
+    ('times', lambda a, b: a * -2),
+    ('invert', lambda a, b: ~a),
+    ('update', lambda a, b: a.update(b)),
+    ('positive', lambda a, b: list(a.positive())),
+    ('dot', lambda a, b: a.dot(b)),
+    ('cosine', lambda a, b: a.cosine(b)),
+    ('axpy', lambda a, b: a.axpy(3, b)),
+):
+    _counter_case('counter.{}'.format(_name), _operation)
+
+
+@case('counter.cosine_many')
+def counter_cosine_many(size: str) -> Thunk:
+    from yeetlong.vectors import CounterMatrix
+
+    pairs = _counters(size)
+    matrix = CounterMatrix([b for _, b in pairs])
+    return lambda: [matrix.cosine(a) for a, _ in pairs[:8]]
+
+
+@case('frozen_counter.hash')
+def frozen_counter_hash(size: str) -> Thunk:
+    from yeetlong.counters import FrozenCounter
+
+    counters = [FrozenCounter(count_map) for count_map in datasets.signed_count_maps(size)]
+    return lambda: [hash(counter) for counter in counters]
+
+
+def _keys(size: str) -> t.List[str]:
+    return list(datasets.count_maps(size)[0].keys())
+
+
+@case('indexed_ordered_dict.insert')
+def indexed_ordered_dict_insert(size: str) -> Thunk:
+    from yeetlong.maps import IndexedOrderedDict
+
+    keys = _keys(size)
+
+    def run():
+        mapping = IndexedOrderedDict()
+        for value, key in enumerate(keys):
+            mapping[key] = value
+        return mapping
+
+    return run
+
+
+@case('indexed_ordered_dict.delete')
+def indexed_ordered_dict_delete(size: str) -> Thunk:
+    from yeetlong.maps import IndexedOrderedDict
+
+    keys = _keys(size)
+    mapping = IndexedOrderedDict((key, value) for value, key in enumerate(keys))
+
+    def run():
+        for key in keys[::2]:
+            del mapping[key]
+
+    return run
+
+
+@case('indexed_ordered_dict.index')
+def indexed_ordered_dict_index(size: str) -> Thunk:
+    from yeetlong.maps import IndexedOrderedDict
+
+    keys = _keys(size)
+    mapping = IndexedOrderedDict((key, value) for value, key in enumerate(keys))
+    probes = keys[::max(1, len(keys) // 200)]
+
+    def run():
+        for index in range(len(mapping)):
+            mapping.get_value_by_index(index)
+        for key in probes:
+            mapping.get_index_of_key(key)
+
+    return run
+
+
+@case('indexed_ordered_dict.sort')
+def indexed_ordered_dict_sort(size: str) -> Thunk:
+    from yeetlong.maps import IndexedOrderedDict
+
+    keys = _keys(size)
+    mapping = IndexedOrderedDict((key, len(key)) for key in keys)
+    return lambda: mapping.sort(key = lambda item: item[1])
+
+
+@case('ordered_default_dict.access')
+def ordered_default_dict_access(size: str) -> Thunk:
+    from yeetlong.maps import OrderedDefaultDict
+
+    elements = [element for count_map in datasets.count_maps(size) for element in datasets.expanded(count_map)]
+
+    def run():
+        mapping = OrderedDefaultDict(int)
+        for element in elements:
+            mapping[element] += 1
+        return mapping
+
+    return run
+
+
+@case('task_awaiter.contention', sizes=('deck',))
+def task_awaiter_contention(size: str) -> Thunk:
+    from yeetlong.taskawaiter import TaskAwaiter
+
+    threads = 8
+    keys = [key % 64 for key in range(2000)]
+
+    def run():
+        awaiter = TaskAwaiter()
+        barrier = threading.Barrier(threads)
+
+        def worker():
+            barrier.wait()
+            for key in keys:
+                event, in_progress = awaiter.get_condition(key)
+                if in_progress:
+                    event.wait()
+                else:
+                    event.set_value(key)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    return run
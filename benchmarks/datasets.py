@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import typing as t
+import random
+
+
+DECK_SIZE = 60
+DECK_DISTINCT = 24
+DECK_BATCH = 1000
+
+COLLECTION_DISTINCT = 20000
+COLLECTION_BATCH = 4
+
+MAX_COPIES = 4
+
+SIZES = ('deck', 'collection')
+
+
+def card_name(index: int) -> str:
+    return 'card-{:05d}'.format(index)
+
+
+def _deck(rng: random.Random, pool: int) -> t.Dict[str, int]:
+    deck = {}
+    remaining = DECK_SIZE
+    for index in rng.sample(range(pool), DECK_DISTINCT):
+        if remaining <= 0:
+            break
+        multiplicity = min(rng.randint(1, MAX_COPIES), remaining)
+        deck[card_name(index)] = multiplicity
+        remaining -= multiplicity
+    return deck
+
+
+def _collection(rng: random.Random) -> t.Dict[str, int]:
+    return {
+        card_name(index): rng.randint(1, MAX_COPIES)
+        for index in
+        range(COLLECTION_DISTINCT)
+        if rng.random() < .75
+    }
+
+
+def count_maps(size: str, seed: int = 0) -> t.List[t.Dict[str, int]]:
+    rng = random.Random('{}-{}'.format(size, seed))
+    if size == 'deck':
+        return [_deck(rng, COLLECTION_DISTINCT // 20) for _ in range(DECK_BATCH)]
+    if size == 'collection':
+        return [_collection(rng) for _ in range(COLLECTION_BATCH)]
+    raise ValueError('Unknown dataset size {!r}'.format(size))
+
+
+def count_map_pairs(size: str) -> t.List[t.Tuple[t.Dict[str, int], t.Dict[str, int]]]:
+    return list(zip(count_maps(size, 0), count_maps(size, 1)))
+
+
+def signed_count_maps(size: str, seed: int = 0) -> t.List[t.Dict[str, int]]:
+    rng = random.Random('signed-{}-{}'.format(size, seed))
+    return [
+        {
+            element: multiplicity if rng.random() < .5 else -multiplicity
+            for element, multiplicity in
+            count_map.items()
+        }
+        for count_map in
+        count_maps(size, seed)
+    ]
+
+
+def expanded(count_map: t.Mapping[str, int]) -> t.List[str]:
+    return [element for element, multiplicity in count_map.items() for _ in range(multiplicity)]
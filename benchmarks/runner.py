@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import typing as t
+import fnmatch
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import yeetlong
+
+from benchmarks.cases import CASES
+
+
+Result = t.Dict[str, t.Any]
+
+
+def _revision() -> t.Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output = True,
+            text = True,
+            check = True,
+            cwd = os.path.dirname(os.path.abspath(yeetlong.__path__[0])),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time(factory: t.Callable[[], t.Callable[[], t.Any]], repeat: int) -> t.List[float]:
+    timings = []
+    for _ in range(repeat):
+        thunk = factory()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            thunk()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return timings
+
+
+def _peak_memory(factory: t.Callable[[], t.Callable[[], t.Any]]) -> int:
+    thunk = factory()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        thunk()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(patterns: t.Sequence[str] = ('*',), repeat: int = 5) -> Result:
+    results = {}
+    for name, factory in CASES.items():
+        if not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            continue
+        try:
+            timings = _time(factory, repeat)
+            results[name] = {
+                'min': min(timings),
+                'median': statistics.median(timings),
+                'peak_memory': _peak_memory(factory),
+            }
+        except Exception as e:
+            results[name] = {'error': '{}: {}'.format(e.__class__.__name__, e)}
+    return {
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+class Comparison(t.NamedTuple):
+    name: str
+    metric: str
+    base: float
+    head: float
+    error: t.Optional[str] = None
+
+    @property
+    def ratio(self) -> float:
+        return self.head / self.base if self.base else float('inf')
+
+
+def compare(
+    base: Result,
+    head: Result,
+    threshold: float = .1,
+    memory_threshold: float = .1,
+) -> t.Tuple[t.List[Comparison], t.List[Comparison]]:
+    comparisons = []
+    regressions = []
+    base_results = base['results']
+    for name, head_result in head['results'].items():
+        base_result = base_results.get(name)
+        if base_result is None or 'error' in base_result:
+            continue
+        if 'error' in head_result:
+            # A case that ran at base and fails at head is the worst possible regression.
+            comparison = Comparison(name, 'error', base_result['min'], float('inf'), head_result['error'])
+            comparisons.append(comparison)
+            regressions.append(comparison)
+            continue
+        for metric, limit in (('min', threshold), ('peak_memory', memory_threshold)):
+            comparison = Comparison(name, metric, base_result[metric], head_result[metric])
+            comparisons.append(comparison)
+            if comparison.ratio > 1 + limit:
+                regressions.append(comparison)
+    return comparisons, regressions
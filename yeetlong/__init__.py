@@ -0,0 +1,5 @@
+import os
+
+
+if os.environ.get('YEETLONG_PROFILE'):
+    from yeetlong import profiling  # noqa: F401
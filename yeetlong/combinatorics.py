@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import typing as t
+import math
+
+from yeetlong.multiset import BaseMultiset, FrozenMultiset
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'sub_multisets',
+    'count_sub_multisets',
+    'draw_probability',
+    'probability_exactly',
+    'probability_at_least',
+    'probability_contains',
+]
+
+
+def _compositions(multiplicities: t.Sequence[int], size: int) -> t.Iterator[t.List[int]]:
+    """
+    Yields every counts list with 0 <= counts[i] <= multiplicities[i] summing to size, in decreasing
+    lexicographic order. The same list is updated in place between yields.
+    """
+    length = len(multiplicities)
+    if size < 0 or size > sum(multiplicities):
+        return
+
+    counts = [0] * length
+    remaining = size
+    for index in range(length):
+        counts[index] = min(multiplicities[index], remaining)
+        remaining -= counts[index]
+
+    while True:
+        yield counts
+
+        # Find the rightmost position that can give one copy to the positions after it.
+        tail = 0
+        capacity = 0
+        index = length - 1
+        while index >= 0:
+            if counts[index] and tail < capacity:
+                break
+            tail += counts[index]
+            capacity += multiplicities[index]
+            index -= 1
+        else:
+            return
+
+        counts[index] -= 1
+        remaining = tail + 1
+        for position in range(index + 1, length):
+            counts[position] = min(multiplicities[position], remaining)
+            remaining -= counts[position]
+
+
+def sub_multisets(
+    multiset: t.Iterable[T],
+    size: int,
+    cls: t.Type[BaseMultiset[T]] = FrozenMultiset,
+) -> t.Iterator[t.Tuple[BaseMultiset[T], int]]:
+    """
+    Lazily yields every distinct sub-multiset with size elements exactly once, along with its weight, the
+    number of size-combinations of the expanded multiset that produce it (the product of C(m, c) over its
+    elements). The weights sum to C(len(multiset), size), so dividing by that gives the hypergeometric
+    probability of drawing it. Memory is bounded by the number of distinct elements.
+    """
+    mapping = BaseMultiset._as_mapping(multiset)
+    elements = list(mapping.keys())
+    multiplicities = [mapping[element] for element in elements]
+
+    for counts in _compositions(multiplicities, size):
+        weight = 1
+        for multiplicity, count in zip(multiplicities, counts):
+            if count:
+                weight *= math.comb(multiplicity, count)
+        yield cls({element: count for element, count in zip(elements, counts) if count}), weight
+
+
+def count_sub_multisets(multiset: t.Iterable[T], size: int) -> int:
+    """
+    Number of distinct sub-multisets with size elements, counted without enumerating them.
+    """
+    if size < 0:
+        return 0
+    ways = [1] + [0] * size
+    for multiplicity in BaseMultiset._as_mapping(multiset).values():
+        window = 0
+        updated = [0] * (size + 1)
+        for total in range(size + 1):
+            window += ways[total]
+            if total > multiplicity:
+                window -= ways[total - multiplicity - 1]
+            updated[total] = window
+        ways = updated
+    return ways[size]
+
+
+def draw_probability(multiset: t.Iterable[T], hand: t.Iterable[T]) -> float:
+    """
+    Probability that drawing len(hand) elements without replacement yields exactly hand.
+    """
+    mapping = BaseMultiset._as_mapping(multiset)
+    hand = BaseMultiset._as_mapping(hand)
+    total = sum(mapping.values())
+    draws = sum(hand.values())
+    if draws > total:
+        return 0.
+    weight = 1
+    for element, count in hand.items():
+        weight *= math.comb(mapping.get(element, 0), count)
+    return weight / math.comb(total, draws)
+
+
+def _successes(multiset: t.Iterable[T], elements: t.Iterable[T]) -> t.Tuple[int, int]:
+    mapping = BaseMultiset._as_mapping(multiset)
+    return sum(mapping.get(element, 0) for element in set(elements)), sum(mapping.values())
+
+
+def probability_exactly(multiset: t.Iterable[T], elements: t.Iterable[T], copies: int, draws: int) -> float:
+    """
+    Probability of drawing exactly copies elements from among elements in draws draws without replacement.
+    """
+    successes, total = _successes(multiset, elements)
+    if draws > total or not 0 <= copies <= draws:
+        return 0.
+    return math.comb(successes, copies) * math.comb(total - successes, draws - copies) / math.comb(total, draws)
+
+
+def probability_at_least(multiset: t.Iterable[T], elements: t.Iterable[T], copies: int, draws: int) -> float:
+    """
+    Probability of drawing at least copies elements from among elements in draws draws without
+    replacement, the upper tail of the hypergeometric distribution.
+    """
+    successes, total = _successes(multiset, elements)
+    if draws > total:
+        return 0.
+    failures = total - successes
+    weight = sum(
+        math.comb(successes, hits) * math.comb(failures, draws - hits)
+        for hits in
+        range(max(copies, 0), min(draws, successes) + 1)
+    )
+    return weight / math.comb(total, draws)
+
+
+def probability_contains(multiset: t.Iterable[T], required: t.Iterable[T], draws: int) -> float:
+    """
+    Probability that draws draws without replacement contain required as a sub-multiset. Only the counts
+    of the required elements are enumerated, the remaining elements are counted in closed form.
+    """
+    mapping = BaseMultiset._as_mapping(multiset)
+    required = BaseMultiset._as_mapping(required)
+    total = sum(mapping.values())
+    if draws > total:
+        return 0.
+
+    elements = [element for element, count in required.items() if count > 0]
+    available = [mapping.get(element, 0) for element in elements]
+    minimums = [required[element] for element in elements]
+    if any(needed > multiplicity for needed, multiplicity in zip(minimums, available)):
+        return 0.
+    others = total - sum(available)
+
+    # ways[drawn] counts the ways to draw drawn elements among the required ones meeting every minimum.
+    ways = {0: 1}
+    for multiplicity, needed in zip(available, minimums):
+        updated: t.Dict[int, int] = {}
+        for drawn, count in ways.items():
+            for copies in range(needed, min(multiplicity, draws - drawn) + 1):
+                updated[drawn + copies] = updated.get(drawn + copies, 0) + count * math.comb(multiplicity, copies)
+        ways = updated
+
+    weight = sum(count * math.comb(others, draws - drawn) for drawn, count in ways.items())
+    return weight / math.comb(total, draws)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import typing as t
+import functools
+import struct
+from collections import defaultdict
+from collections.abc import ItemsView, Mapping, ValuesView
+
+
+T = t.TypeVar('T')
+V = t.TypeVar('V')
+
+__all__ = [
+    'COMPACT_THRESHOLD',
+    'ReadOnlyCounts',
+    'CompactCounts',
+    'compact',
+]
+
+COMPACT_THRESHOLD = 20
+
+_MIN_COUNT = -128
+_MAX_COUNT = 127
+
+
+@functools.lru_cache(maxsize = None)
+def _layout(size: int) -> struct.Struct:
+    return struct.Struct('<{}b'.format(size))
+
+
+class _ReadOnlyItemsView(ItemsView):
+
+    def __iter__(self) -> t.Iterator[t.Tuple[T, int]]:
+        return self._mapping._items()
+
+
+class _ReadOnlyValuesView(ValuesView):
+
+    def __iter__(self) -> t.Iterator[int]:
+        return self._mapping._values()
+
+
+class ReadOnlyCounts(Mapping):
+    """
+    Base of the immutable element -> count mappings that stand in for the defaultdict storage of frozen
+    multisets and counters. Subclasses implement _lookup, _items and __len__, missing elements read as 0.
+    """
+    __slots__ = ()
+
+    def _lookup(self, element: T) -> t.Optional[int]:
+        raise NotImplementedError()
+
+    def _items(self) -> t.Iterator[t.Tuple[T, int]]:
+        raise NotImplementedError()
+
+    def _values(self) -> t.Iterator[int]:
+        return (count for _, count in self._items())
+
+    def __contains__(self, element: T) -> bool:
+        return self._lookup(element) is not None
+
+    def __getitem__(self, element: T) -> int:
+        count = self._lookup(element)
+        return 0 if count is None else count
+
+    def get(self, element: T, default: t.Optional[V] = None) -> t.Union[int, V, None]:
+        count = self._lookup(element)
+        return default if count is None else count
+
+    def __iter__(self) -> t.Iterator[T]:
+        return (element for element, _ in self._items())
+
+    def items(self) -> t.ItemsView[T, int]:
+        return _ReadOnlyItemsView(self)
+
+    def values(self) -> t.ValuesView[int]:
+        return _ReadOnlyValuesView(self)
+
+    def copy(self) -> t.DefaultDict[T, int]:
+        return defaultdict(int, self._items())
+
+    def __eq__(self, other: t.Any) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if len(other) != len(self):
+            return False
+        get = other.get
+        return all(get(element) == count for element, count in self._items())
+
+    def __ne__(self, other: t.Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            self.__class__.__name__,
+            dict(self._items()),
+        )
+
+
+class CompactCounts(ReadOnlyCounts):
+    """
+    Counts of small frozen multisets and counters. The elements are kept in a tuple and looked up by a
+    linear scan, the counts are packed into a bytes object as signed bytes.
+    """
+    __slots__ = ('_keys', '_counts')
+
+    def __init__(self, keys: t.Tuple[T, ...], counts: bytes) -> None:
+        self._keys = keys
+        self._counts = counts
+
+    @classmethod
+    def from_mapping(cls, mapping: t.Mapping[T, int]) -> t.Optional[CompactCounts]:
+        counts = tuple(mapping.values())
+        for count in counts:
+            if type(count) is not int or not _MIN_COUNT <= count <= _MAX_COUNT:
+                return None
+        return cls(tuple(mapping.keys()), _layout(len(counts)).pack(*counts))
+
+    def _unpack(self) -> t.Tuple[int, ...]:
+        return _layout(len(self._keys)).unpack(self._counts)
+
+    def _lookup(self, element: T) -> t.Optional[int]:
+        try:
+            index = self._keys.index(element)
+        except ValueError:
+            return None
+        count = self._counts[index]
+        return count - 256 if count > _MAX_COUNT else count
+
+    def _items(self) -> t.Iterator[t.Tuple[T, int]]:
+        return zip(self._keys, self._unpack())
+
+    def _values(self) -> t.Iterator[int]:
+        return iter(self._unpack())
+
+    def __contains__(self, element: T) -> bool:
+        return element in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> t.Iterator[T]:
+        return iter(self._keys)
+
+    def __eq__(self, other: t.Any) -> bool:
+        if isinstance(other, CompactCounts) and self._keys == other._keys and self._counts == other._counts:
+            return True
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return self.__class__, (self._keys, self._counts)
+
+
+def compact(mapping: t.Mapping[T, int], threshold: t.Optional[int] = None) -> t.Mapping[T, int]:
+    if len(mapping) > (COMPACT_THRESHOLD if threshold is None else threshold):
+        return mapping
+    result = CompactCounts.from_mapping(mapping)
+    return mapping if result is None else result
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import typing as t
+import math
 from collections import defaultdict
 
+from yeetlong.compact import CompactCounts, compact
+from yeetlong.fingerprint import combine_fingerprints, counts_fingerprint, scale_fingerprint
+from yeetlong.maps import StorageItemsView, StorageKeysView, StorageValuesView
+
 
 T = t.TypeVar('T')
 V = t.TypeVar('V')
@@ -21,6 +26,10 @@ class BaseCounter(t.Mapping[T, int]):
         if items is not None:
             if isinstance(items, t.Mapping):
                 self._elements.update(items)
+                # Zero counts are never stored, so equal counters have equal storage, hashes and fingerprints.
+                if 0 in self._elements.values():
+                    for element in [element for element, multiplicity in self._elements.items() if multiplicity == 0]:
+                        del self._elements[element]
             else:
                 for item in items:
                     self._elements[item] += 1
@@ -34,7 +43,7 @@ class BaseCounter(t.Mapping[T, int]):
         return element in self._elements
 
     def __getitem__(self, element: T) -> int:
-        return self._elements.__getitem__(element)
+        return self._elements.get(element, 0)
 
     def __str__(self) -> str:
         return '{{{}}}'.format(
@@ -66,7 +75,7 @@ class BaseCounter(t.Mapping[T, int]):
 
     def difference(self, *others: t.Mapping[T, int]) -> BaseCounter[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_counter, others):
             for element, multiplicity in other.items():
@@ -86,7 +95,7 @@ class BaseCounter(t.Mapping[T, int]):
 
     def combine(self, *others: t.Mapping[T, int]) -> BaseCounter[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -105,7 +114,7 @@ class BaseCounter(t.Mapping[T, int]):
         if factor == 0:
             return self.__class__()
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
         for element in _elements:
             _elements[element] *= factor
         return result
@@ -130,6 +139,9 @@ class BaseCounter(t.Mapping[T, int]):
 
     __copy__ = copy
 
+    def _writable_elements(self) -> t.MutableMapping[T, int]:
+        return self._elements
+
     def items(self) -> t.Iterable[t.Tuple[T, int]]:
         return self._elements.items()
 
@@ -157,6 +169,23 @@ class BaseCounter(t.Mapping[T, int]):
 
     values: t.Callable[[], t.ValuesView[T]] = multiplicities
 
+    def dot(self, other: t.Mapping[T, int]) -> int:
+        first, second = self._elements, self._as_mapping(other)
+        if len(first) > len(second):
+            first, second = second, first
+        get = second.get
+        return sum(multiplicity * get(element, 0) for element, multiplicity in first.items())
+
+    def norm(self) -> float:
+        return math.sqrt(sum(multiplicity * multiplicity for multiplicity in self._elements.values()))
+
+    def cosine(self, other: t.Mapping[T, int]) -> float:
+        other = self._as_counter(other)
+        norms = self.norm() * other.norm()
+        if not norms:
+            return 0.
+        return self.dot(other) / norms
+
     @classmethod
     def _as_counter(cls, other: t.Mapping[T, int]) -> BaseCounter[T]:
         if isinstance(other, BaseCounter):
@@ -177,10 +206,51 @@ class BaseCounter(t.Mapping[T, int]):
 
 
 class Counter(BaseCounter[T]):
-    __slots__ = ()
+    """
+    Mutable counter, its storage is shared copy-on-write like that of Multiset.
+    """
+    __slots__ = ('_shared',)
+
+    def __init__(self, items: t.Union[t.Mapping[T, int], t.Iterable[T], None] = None) -> None:
+        if type(items) is self.__class__:
+            self._elements = items._elements
+            self._shared = items._shared = True
+            return
+        super().__init__(items)
+        self._shared = False
+
+    def _writable_elements(self) -> t.MutableMapping[T, int]:
+        if self._shared:
+            self._elements = self._elements.copy()
+            self._shared = False
+        return self._elements
+
+    def snapshot(self) -> FrozenCounter[T]:
+        result = FrozenCounter.__new__(FrozenCounter)
+        result._elements = self._elements
+        self._shared = True
+        return result
+
+    freeze = snapshot
+
+    # The storage is replaced on the first write after sharing it, so views go through self.
+    def items(self) -> t.ItemsView[T, int]:
+        return StorageItemsView(self)
+
+    def distinct_elements(self) -> t.KeysView[T]:
+        return StorageKeysView(self)
+
+    def multiplicities(self) -> t.ValuesView[int]:
+        return StorageValuesView(self)
+
+    values = multiplicities
+
+    def __setstate__(self, state):
+        self._elements = state
+        self._shared = False
 
     def __setitem__(self, element: T, multiplicity: int) -> None:
-        _elements = self._elements
+        _elements = self._writable_elements()
         if element in _elements:
             if multiplicity == 0:
                 del _elements[element]
@@ -191,12 +261,12 @@ class Counter(BaseCounter[T]):
 
     def __delitem__(self, element: T) -> None:
         if element in self._elements:
-            del self._elements[element]
+            del self._writable_elements()[element]
         else:
             raise KeyError("Could not delete {!r} from the Counter, because it is not in it.".format(element))
 
     def update(self, *others: t.Mapping[T, int]) -> Counter[T]:
-        _elements = self._elements
+        _elements = self._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -206,11 +276,26 @@ class Counter(BaseCounter[T]):
 
         return self
 
+    def axpy(self, factor: int, other: t.Mapping[T, int]) -> Counter[T]:
+        _elements = self._writable_elements()
+        other = self._as_mapping(other)
+        # c.axpy(factor, c) would update the mapping it iterates over.
+        items = list(other.items()) if other is _elements else other.items()
+
+        for element, multiplicity in items:
+            new_multiplicity = _elements.get(element, 0) + factor * multiplicity
+            if new_multiplicity == 0:
+                _elements.pop(element, None)
+            else:
+                _elements[element] = new_multiplicity
+
+        return self
+
     def times_update(self, factor: int) -> Counter[T]:
         if factor == 0:
             self.clear()
         else:
-            _elements = self._elements
+            _elements = self._writable_elements()
             for element in _elements:
                 _elements[element] *= factor
 
@@ -223,7 +308,10 @@ class Counter(BaseCounter[T]):
         if multiplicity == 0:
             pass
         else:
-            self._elements[element] += multiplicity
+            _elements = self._writable_elements()
+            _elements[element] += multiplicity
+            if _elements[element] == 0:
+                del _elements[element]
 
         return self
 
@@ -231,17 +319,84 @@ class Counter(BaseCounter[T]):
         return self.add(element, -multiplicity)
 
     def pop(self, element: T, default: t.Optional[V] = None) -> t.Union[int, V, None]:
-        return self._elements.pop(element, default)
+        if element not in self._elements:
+            return default
+        return self._writable_elements().pop(element)
 
     def clear(self) -> BaseCounter[T]:
-        self._elements.clear()
+        if self._shared:
+            self._elements = defaultdict(int)
+            self._shared = False
+        else:
+            self._elements.clear()
         return self
 
 
 class FrozenCounter(BaseCounter[T]):
-    __slots__ = ('_hash',)
+    __slots__ = ('_hash', '_fingerprint')
+
+    def __init__(self, items: t.Union[t.Mapping[T, int], t.Iterable[T], None] = None) -> None:
+        if type(items) is self.__class__ and isinstance(items._elements, CompactCounts):
+            self._elements = items._elements
+            return
+        super().__init__(items)
+
+    def copy(self) -> FrozenCounter[T]:
+        result = self.__class__.__new__(self.__class__)
+        result._elements = self._elements.copy()
+        return result
+
+    __copy__ = copy
+
+    def compact(self, threshold: t.Optional[int] = None) -> FrozenCounter[T]:
+        """
+        Copy of this counter in the packed storage of yeetlong.compact, which takes less memory but looks
+        elements up by a linear scan, for keeping many small counters that are rarely queried. Returns
+        self when it has more than threshold (COMPACT_THRESHOLD) distinct elements or counts outside
+        -128..127.
+        """
+        if type(self._elements) is not defaultdict:
+            return self
+        _elements = compact(self._elements, threshold)
+        if _elements is self._elements:
+            return self
+        result = self.__class__.__new__(self.__class__)
+        result._elements = _elements
+        return result
 
     def __hash__(self) -> int:
         if not hasattr(self, '_hash') or self._hash is None:
             self._hash = hash(frozenset(self._elements.items()))
         return self._hash
+
+    def fingerprint(self) -> int:
+        if not hasattr(self, '_fingerprint') or self._fingerprint is None:
+            self._fingerprint = counts_fingerprint(self._elements.items())
+        return self._fingerprint
+
+    def _derive_fingerprint(self, result: BaseCounter[T], others: t.Sequence[t.Mapping[T, int]], sign: int) -> None:
+        if (
+            getattr(self, '_fingerprint', None) is not None
+            and isinstance(result, FrozenCounter)
+            and all(isinstance(other, FrozenCounter) for other in others)
+        ):
+            result._fingerprint = combine_fingerprints(
+                self._fingerprint,
+                *(scale_fingerprint(other.fingerprint(), sign) for other in others)
+            )
+
+    def combine(self, *others: t.Mapping[T, int]) -> BaseCounter[T]:
+        result = super().combine(*others)
+        self._derive_fingerprint(result, others, 1)
+        return result
+
+    def difference(self, *others: t.Mapping[T, int]) -> BaseCounter[T]:
+        result = super().difference(*others)
+        self._derive_fingerprint(result, others, -1)
+        return result
+
+    def times(self, factor: int) -> BaseCounter[T]:
+        result = super().times(factor)
+        if getattr(self, '_fingerprint', None) is not None and isinstance(result, FrozenCounter):
+            result._fingerprint = scale_fingerprint(self._fingerprint, factor)
+        return result
@@ -1,31 +1,62 @@
 import typing as t
+import itertools
+
+
+class Message(object):
+    __slots__ = ('_template', '_args', '_kwargs')
+
+    def __init__(self, template: str, *args: t.Any, **kwargs: t.Any):
+        self._template = template
+        self._args = args
+        self._kwargs = kwargs
+
+    def __str__(self) -> str:
+        return self._template.format(*self._args, **self._kwargs)
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(
+            self.__class__.__name__,
+            str(self),
+        )
 
 
 class Errors(object):
 
-    def __init__(self, errors: t.Optional[t.Sequence[str]] = None):
+    def __init__(self, errors: t.Optional[t.Sequence[t.Union[str, Message]]] = None):
         self._errors = [] if errors is None else errors
+        self._formatted = False
+
+    @classmethod
+    def merge(cls, errors: t.Iterable['Errors']) -> 'Errors':
+        return cls(list(itertools.chain.from_iterable(_errors._errors for _errors in errors)))
 
     @property
     def errors(self) -> t.Sequence[str]:
+        if not self._formatted:
+            if any(isinstance(error, Message) for error in self._errors):
+                self._errors = [str(error) for error in self._errors]
+            self._formatted = True
         return self._errors
 
     def __bool__(self) -> bool:
         return not self._errors
 
+    def __add__(self, other: 'Errors') -> 'Errors':
+        return self.merge((self, other))
+
     def __iter__(self):
         yield bool(self)
-        yield self._errors
+        yield self.errors
 
     def __getitem__(self, item):
         if item == 0:
             return bool(self)
         if item == 1:
-            return self._errors
+            return self.errors
         raise IndexError()
 
     def __repr__(self) -> str:
         return '{}({})'.format(
             self.__class__.__name__,
-            self._errors,
+            self.errors,
         )
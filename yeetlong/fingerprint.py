@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import typing as t
+import functools
+import hashlib
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'FINGERPRINT_BITS',
+    'element_digest',
+    'counts_fingerprint',
+    'items_fingerprint',
+    'combine_fingerprints',
+    'scale_fingerprint',
+    'jump_hash',
+    'shard',
+]
+
+FINGERPRINT_BITS = 128
+
+_DIGEST_SIZE = FINGERPRINT_BITS // 8
+_MASK = (1 << FINGERPRINT_BITS) - 1
+_LENGTH_SIZE = 8
+
+
+def _framed(parts: t.Iterable[bytes]) -> bytes:
+    return b''.join(
+        len(part).to_bytes(_LENGTH_SIZE, 'little') + part
+        for part in
+        parts
+    )
+
+
+def _encode(value: t.Any) -> bytes:
+    """
+    Canonical encoding of a value, equal values (1, 1.0 and True included) encode to the same bytes
+    independently of the process, its hash seed and the python version.
+    """
+    if value is None:
+        return b'n'
+    if isinstance(value, (bool, int)):
+        return b'i' + str(int(value)).encode('ascii')
+    if isinstance(value, float):
+        if value.is_integer():
+            return b'i' + str(int(value)).encode('ascii')
+        return b'f' + value.hex().encode('ascii')
+    if isinstance(value, str):
+        return b's' + value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b'b' + bytes(value)
+    fingerprint = getattr(value, 'fingerprint', None)
+    if fingerprint is not None:
+        return b'm' + fingerprint().to_bytes(_DIGEST_SIZE, 'little')
+    if isinstance(value, tuple):
+        return b't' + _framed(map(_encode, value))
+    if isinstance(value, list):
+        return b'l' + _framed(map(_encode, value))
+    if isinstance(value, (frozenset, set)):
+        return b'z' + _framed(sorted(map(_encode, value)))
+    if isinstance(value, t.Mapping):
+        return b'd' + _framed(sorted(_framed((_encode(key), _encode(item))) for key, item in value.items()))
+    raise TypeError('Cannot fingerprint values of type {}'.format(type(value).__name__))
+
+
+def _digest(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size = _DIGEST_SIZE).digest(), 'little')
+
+
+@functools.lru_cache(maxsize = 1 << 16)
+def element_digest(element: T) -> int:
+    return _digest(_encode(element))
+
+
+def counts_fingerprint(items: t.Iterable[t.Tuple[T, int]]) -> int:
+    """
+    Order independent fingerprint of element -> count pairs, the count weighted sum of the element
+    digests modulo 2 ** FINGERPRINT_BITS. Being a sum, the fingerprint of a combination is the sum of the
+    fingerprints of its operands and scaling every count scales the fingerprint.
+    """
+    return sum(count * element_digest(element) for element, count in items) & _MASK
+
+
+def items_fingerprint(items: t.Iterable[t.Tuple[t.Any, t.Any]]) -> int:
+    """
+    Order dependent fingerprint of key -> value pairs, a digest over their canonical encoding.
+    """
+    digest = hashlib.blake2b(digest_size = _DIGEST_SIZE)
+    for key, value in items:
+        digest.update(_framed((_encode(key), _encode(value))))
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def combine_fingerprints(*fingerprints: int) -> int:
+    return sum(fingerprints) & _MASK
+
+
+def scale_fingerprint(fingerprint: int, factor: int) -> int:
+    return fingerprint * factor & _MASK
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash of Lamping and Veach, maps a 64 bit key onto one of buckets so that growing
+    buckets by one only moves 1 / buckets of the keys.
+    """
+    if buckets <= 0:
+        raise ValueError('The number of buckets must be positive.')
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def shard(value: t.Any, shards: int) -> int:
+    """
+    Consistently assigns a fingerprint, or anything with a fingerprint method, to one of shards.
+    """
+    fingerprint = value if isinstance(value, int) else value.fingerprint()
+    return jump_hash(fingerprint ^ fingerprint >> 64, shards)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import typing as t
+from collections import defaultdict
+
+from yeetlong.multiset import BaseMultiset, FrozenMultiset
+
+
+T = t.TypeVar('T')
+K = t.TypeVar('K')
+
+__all__ = [
+    'MultisetIndex',
+]
+
+
+class MultisetIndex(t.Generic[K, T]):
+    """
+    Inverted index over many multisets answering which of them are sub- or super-multisets of a probe.
+    Postings are kept per element and multiplicity, so a stored multiset is listed once for each
+    (element, multiplicity) it contains. Each stored multiset also carries a bloom signature over
+    (element, threshold) pairs, which rejects most superset candidates without touching the multiset.
+    """
+
+    def __init__(
+        self,
+        multisets: t.Union[t.Mapping[K, BaseMultiset[T]], t.Iterable[BaseMultiset[T]], None] = None,
+        signature_bits: int = 256,
+        signature_depth: int = 4,
+    ) -> None:
+        self._signature_bits = signature_bits
+        self._signature_depth = signature_depth
+        self._multisets: t.Dict[K, FrozenMultiset[T]] = {}
+        self._signatures: t.Dict[K, int] = {}
+        self._sizes: t.Dict[K, int] = {}
+        self._distinct_counts: t.Dict[K, int] = {}
+        self._postings: t.DefaultDict[T, t.DefaultDict[int, t.Set[K]]] = defaultdict(lambda: defaultdict(set))
+        self._element_frequencies: t.DefaultDict[T, int] = defaultdict(int)
+        self._empty: t.Set[K] = set()
+
+        if multisets is not None:
+            if isinstance(multisets, t.Mapping):
+                for key, multiset in multisets.items():
+                    self.add(multiset, key)
+            else:
+                for multiset in multisets:
+                    self.add(multiset)
+
+    def _signature(self, multiset: BaseMultiset[T]) -> int:
+        signature = 0
+        bits = self._signature_bits
+        for element, multiplicity in multiset.items():
+            for threshold in range(1, min(multiplicity, self._signature_depth) + 1):
+                signature |= 1 << hash((element, threshold)) % bits
+        return signature
+
+    def add(self, multiset: BaseMultiset[T], key: t.Optional[K] = None) -> K:
+        if not isinstance(multiset, FrozenMultiset):
+            multiset = FrozenMultiset(multiset)
+        if key is None:
+            key = multiset
+        if key in self._multisets:
+            self.remove(key)
+
+        self._multisets[key] = multiset
+        self._signatures[key] = self._signature(multiset)
+        self._sizes[key] = len(multiset)
+        self._distinct_counts[key] = len(multiset.distinct_elements())
+
+        if not multiset:
+            self._empty.add(key)
+
+        for element, multiplicity in multiset.items():
+            self._postings[element][multiplicity].add(key)
+            self._element_frequencies[element] += 1
+
+        return key
+
+    def remove(self, key: K) -> FrozenMultiset[T]:
+        multiset = self._multisets.pop(key)
+        del self._signatures[key]
+        del self._sizes[key]
+        del self._distinct_counts[key]
+        self._empty.discard(key)
+
+        for element, multiplicity in multiset.items():
+            postings = self._postings[element]
+            keys = postings[multiplicity]
+            keys.discard(key)
+            if not keys:
+                del postings[multiplicity]
+                if not postings:
+                    del self._postings[element]
+            self._element_frequencies[element] -= 1
+            if not self._element_frequencies[element]:
+                del self._element_frequencies[element]
+
+        return multiset
+
+    def discard(self, key: K) -> t.Optional[FrozenMultiset[T]]:
+        if key in self._multisets:
+            return self.remove(key)
+        return None
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._multisets
+
+    def __getitem__(self, key: K) -> FrozenMultiset[T]:
+        return self._multisets[key]
+
+    def __len__(self) -> int:
+        return len(self._multisets)
+
+    def __iter__(self) -> t.Iterator[K]:
+        return iter(self._multisets)
+
+    def items(self) -> t.ItemsView[K, FrozenMultiset[T]]:
+        return self._multisets.items()
+
+    def subsets(self, probe: t.Iterable[T], strict: bool = False) -> t.List[K]:
+        probe = BaseMultiset._as_mapping(probe)
+        probe_size = sum(probe.values())
+        hits: t.DefaultDict[K, int] = defaultdict(int)
+
+        for element, available in probe.items():
+            postings = self._postings.get(element)
+            if postings is None:
+                continue
+            for multiplicity, keys in postings.items():
+                if multiplicity <= available:
+                    for key in keys:
+                        hits[key] += 1
+
+        distinct_counts = self._distinct_counts
+        sizes = self._sizes
+        result = [
+            key
+            for key, count in hits.items()
+            if count == distinct_counts[key]
+            and not (strict and sizes[key] == probe_size)
+        ]
+        if not (strict and probe_size == 0):
+            result.extend(self._empty)
+        return result
+
+    def supersets(self, probe: t.Iterable[T], strict: bool = False) -> t.List[K]:
+        probe = {
+            element: multiplicity
+            for element, multiplicity in
+            BaseMultiset._as_mapping(probe).items()
+            if multiplicity > 0
+        }
+        probe_size = sum(probe.values())
+        if not probe:
+            return [key for key, size in self._sizes.items() if not strict or size]
+
+        frequencies = self._element_frequencies
+        elements = sorted(probe, key = lambda element: frequencies.get(element, 0))
+        rarest = elements[0]
+        postings = self._postings.get(rarest)
+        if postings is None:
+            return []
+
+        needed = probe[rarest]
+        signature = self._signature(probe)
+        signatures = self._signatures
+        multisets = self._multisets
+        sizes = self._sizes
+        rest = [(element, probe[element]) for element in elements[1:]]
+
+        return [
+            key
+            for stored, keys in postings.items()
+            if stored >= needed
+            for key in keys
+            if signatures[key] & signature == signature
+            and not (strict and sizes[key] == probe_size)
+            and all(multisets[key].get(element, 0) >= multiplicity for element, multiplicity in rest)
+        ]
@@ -0,0 +1,468 @@
+"""
+Lazy multiset expressions. Operators on lazy(multiset) build an expression tree which is evaluated
+pointwise in a single pass over the candidate distinct elements, without intermediate multisets.
+Note that python operator precedence still applies, in `lazy(a) & d - e` the `d - e` is evaluated eagerly.
+"""
+
+from __future__ import annotations
+
+import typing as t
+import abc
+import functools
+import itertools
+
+from yeetlong.multiset import BaseMultiset, Multiset
+
+
+T = t.TypeVar('T')
+V = t.TypeVar('V')
+
+__all__ = [
+    'LazyMultiset',
+    'lazy',
+]
+
+Evaluator = t.Callable[[T], int]
+Filler = t.Callable[[t.Iterable[T], t.MutableMapping[T, int]], None]
+
+# Subtrees nested deeper than this are compiled into a separate evaluator, which keeps the generated
+# source within the parser's parenthesis nesting and the compiler's recursion limits.
+_MAX_NESTING = 32
+# Chains of + longer than this are emitted as sum(...), long binary chains also recurse in the compiler.
+_MAX_CHAIN = 8
+
+
+@functools.lru_cache(maxsize = 256)
+def _compile(expression: str, arity: int) -> t.Callable[..., t.Tuple[Evaluator, Filler]]:
+    namespace = {}
+    exec(
+        'def factory({arguments}):\n'
+        '    def fill(candidates, elements):\n'
+        '        for e in candidates:\n'
+        '            m = {expression}\n'
+        '            if m > 0:\n'
+        '                elements[e] = m\n'
+        '    return (lambda e, default=0: {expression}), fill\n'.format(
+            arguments = ', '.join('g{}'.format(index) for index in range(arity)),
+            expression = expression,
+        ),
+        namespace,
+    )
+    return namespace['factory']
+
+
+def _describe(root: LazyMultiset[T]) -> str:
+    descriptions = {}
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in descriptions:
+            continue
+        if expanded:
+            descriptions[id(node)] = node._describe_from([descriptions[id(child)] for child in node._children()])
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node._children())
+    return descriptions[id(root)]
+
+
+class LazyMultiset(t.Generic[T], metaclass = abc.ABCMeta):
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def _children(self) -> t.Sequence[LazyMultiset[T]]:
+        pass
+
+    @abc.abstractmethod
+    def _describe_from(self, parts: t.List[str]) -> str:
+        pass
+
+    def _plan(self) -> t.Tuple[t.Tuple[Evaluator, Filler], t.Iterable[T], t.Optional[t.Type[BaseMultiset]]]:
+        """
+        Compiles the tree and finds its distinct candidate elements and the class of its first multiset,
+        in a single walk with an explicit stack, since chained operations can nest trees far deeper
+        than the recursion limit.
+        """
+        getters = []
+        # Expression, nesting height, size estimate, candidate mappings by id and class of the first
+        # multiset of every finished node, by id. Shared subtrees are only visited once.
+        done = {}
+
+        def estimate(node: LazyMultiset[T]) -> int:
+            return done[id(node)][2]
+
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in done:
+                continue
+            if type(node) is _Leaf:
+                mapping = node._mapping
+                done[id(node)] = ('g{}(e, 0)'.format(len(getters)), 0, len(mapping), {id(mapping): mapping}, node._cls)
+                getters.append(mapping.get)
+                continue
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node._children())
+                continue
+
+            parts = []
+            height = 0
+            estimates = []
+            cls = None
+            for child in node._children():
+                expression, child_height, child_estimate, _, child_cls = done[id(child)]
+                if child_height >= _MAX_NESTING:
+                    # Expressions only refer to earlier getters, so the subtree compiles against all of them.
+                    getters.append(_compile(expression, len(getters))(*getters)[0])
+                    expression, child_height = 'g{}(e, 0)'.format(len(getters) - 1), 0
+                    done[id(child)] = (expression, child_height, *done[id(child)][2:])
+                parts.append(expression)
+                height = max(height, child_height + 1)
+                estimates.append(child_estimate)
+                if cls is None:
+                    cls = child_cls
+            sources = {}
+            for operand in node._candidate_operands(estimate):
+                sources.update(done[id(operand)][3])
+            done[id(node)] = (node._format(parts), height, node._estimate_from(estimates), sources, cls)
+
+        expression, _, _, sources, cls = done[id(self)]
+        if len(sources) == 1:
+            candidates = next(iter(sources.values())).keys()
+        else:
+            candidates = dict.fromkeys(
+                itertools.chain.from_iterable(source.keys() for source in sources.values())
+            ).keys()
+        return _compile(expression, len(getters))(*getters), candidates, cls
+
+    def _evaluator(self) -> Evaluator:
+        return self._plan()[0][0]
+
+    def items(self) -> t.Iterator[t.Tuple[T, int]]:
+        (evaluate, _), candidates, _ = self._plan()
+        for element in candidates:
+            multiplicity = evaluate(element)
+            if multiplicity > 0:
+                yield element, multiplicity
+
+    def distinct_elements(self) -> t.Iterator[T]:
+        return (element for element, _ in self.items())
+
+    def multiplicities(self) -> t.Iterator[int]:
+        return (multiplicity for _, multiplicity in self.items())
+
+    def materialize(self, cls: t.Optional[t.Type[BaseMultiset]] = None) -> BaseMultiset[T]:
+        (_, fill), candidates, leaf_class = self._plan()
+        if cls is None:
+            cls = leaf_class or Multiset
+        result = cls()
+        fill(candidates, result._elements)
+        return result
+
+    def multiplicity(self, element: T) -> int:
+        return max(self._evaluator()(element), 0)
+
+    def __contains__(self, element: T) -> bool:
+        return self.multiplicity(element) > 0
+
+    def __getitem__(self, element: T) -> int:
+        multiplicity = self.multiplicity(element)
+        if multiplicity <= 0:
+            raise IndexError()
+        return multiplicity
+
+    def get(self, element: T, default: t.Optional[V] = None) -> t.Union[int, V, None]:
+        multiplicity = self.multiplicity(element)
+        return default if multiplicity <= 0 else multiplicity
+
+    def __len__(self) -> int:
+        return sum(self.multiplicities())
+
+    def __bool__(self) -> bool:
+        return any(True for _ in self.items())
+
+    def __iter__(self) -> t.Iterator[T]:
+        for element, multiplicity in self.items():
+            for _ in range(multiplicity):
+                yield element
+
+    def issubset(self, other: t.Iterable[T]) -> bool:
+        other = _as_mapping(other)
+        return all(multiplicity <= other.get(element, 0) for element, multiplicity in self.items())
+
+    def issuperset(self, other: t.Iterable[T]) -> bool:
+        other = _as_mapping(other)
+        evaluate = self._evaluator()
+        return all(multiplicity <= evaluate(element) for element, multiplicity in other.items() if multiplicity > 0)
+
+    __le__ = issubset
+    __ge__ = issuperset
+
+    def combine(self, *others: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Combine.of(self, *map(_as_node, others))
+
+    def union(self, *others: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Union.of(self, *map(_as_node, others))
+
+    def intersection(self, *others: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Intersection.of(self, *map(_as_node, others))
+
+    def difference(self, *others: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Difference.of(self, *map(_as_node, others))
+
+    def symmetric_difference(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _SymmetricDifference(self, _as_node(other))
+
+    def times(self, factor: int) -> LazyMultiset[T]:
+        if factor < 0:
+            raise ValueError('The factor must no be negative.')
+        return _Times(self, factor)
+
+    def __add__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Combine.of(self, _as_node(other))
+
+    def __radd__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Combine.of(_as_node(other), self)
+
+    def __or__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Union.of(self, _as_node(other))
+
+    def __ror__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Union.of(_as_node(other), self)
+
+    def __and__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Intersection.of(self, _as_node(other))
+
+    def __rand__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Intersection.of(_as_node(other), self)
+
+    def __sub__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Difference.of(self, _as_node(other))
+
+    def __rsub__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _Difference.of(_as_node(other), self)
+
+    def __xor__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _SymmetricDifference(self, _as_node(other))
+
+    def __rxor__(self, other: t.Iterable[T]) -> LazyMultiset[T]:
+        return _SymmetricDifference(_as_node(other), self)
+
+    def __mul__(self, factor: int) -> LazyMultiset[T]:
+        return self.times(factor)
+
+    __rmul__ = __mul__
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            LazyMultiset.__name__,
+            _describe(self),
+        )
+
+
+class _Leaf(LazyMultiset[T]):
+    """
+    A multiset, whose current storage is read on every evaluation since copy-on-write multisets replace
+    it on write, or a plain mapping of counts when cls is None.
+    """
+    __slots__ = ('_source', '_cls')
+
+    def __init__(
+        self,
+        source: t.Union[BaseMultiset[T], t.Mapping[T, int]],
+        cls: t.Optional[t.Type[BaseMultiset]] = None,
+    ) -> None:
+        self._source = source
+        self._cls = cls
+
+    @property
+    def _mapping(self) -> t.Mapping[T, int]:
+        return self._source if self._cls is None else self._source._elements
+
+    def _children(self) -> t.Sequence[LazyMultiset[T]]:
+        return ()
+
+    def _describe_from(self, parts: t.List[str]) -> str:
+        return '{}({})'.format(
+            self._cls.__name__ if self._cls is not None else 'dict',
+            len(self._mapping),
+        )
+
+
+class _Operation(LazyMultiset[T]):
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def _format(self, parts: t.List[str]) -> str:
+        """
+        Expression of this node given the expressions of its children.
+        """
+
+    @abc.abstractmethod
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        pass
+
+    @abc.abstractmethod
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        """
+        Children whose candidates cover those of this node, estimate gives the size of any node.
+        """
+
+
+class _Nary(_Operation[T]):
+    """
+    Associative operation over any number of operands. Building it from another node of the same kind
+    extends that node's operands instead of nesting, so long chains stay flat.
+    """
+    __slots__ = ('_operands',)
+    _symbol: str
+
+    def __init__(self, operands: t.Sequence[LazyMultiset[T]]) -> None:
+        self._operands = tuple(operands)
+
+    @classmethod
+    def of(cls, *nodes: LazyMultiset[T]) -> LazyMultiset[T]:
+        operands = []
+        for node in nodes:
+            if type(node) is cls:
+                operands.extend(node._operands)
+            else:
+                operands.append(node)
+        return operands[0] if len(operands) == 1 else cls(operands)
+
+    def _children(self) -> t.Sequence[LazyMultiset[T]]:
+        return self._operands
+
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        return sum(estimates)
+
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        return self._operands
+
+    def _describe_from(self, parts: t.List[str]) -> str:
+        return '({})'.format(' {} '.format(self._symbol).join(parts))
+
+
+class _Combine(_Nary[T]):
+    __slots__ = ()
+    _symbol = '+'
+
+    def _format(self, parts: t.List[str]) -> str:
+        if len(parts) > _MAX_CHAIN:
+            return 'sum(({},))'.format(', '.join(parts))
+        return '({})'.format(' + '.join(parts))
+
+
+class _Union(_Nary[T]):
+    __slots__ = ()
+    _symbol = '|'
+
+    def _format(self, parts: t.List[str]) -> str:
+        return 'max({})'.format(', '.join(parts))
+
+
+class _Intersection(_Nary[T]):
+    __slots__ = ()
+    _symbol = '&'
+
+    def _format(self, parts: t.List[str]) -> str:
+        return 'min({})'.format(', '.join(parts))
+
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        return min(estimates)
+
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        return (min(self._operands, key = estimate),)
+
+
+class _Difference(_Nary[T]):
+    """
+    The first operand minus all the others. Since multiplicities are never negative, subtracting them
+    one at a time with clamping is the same as subtracting their sum and clamping once.
+    """
+    __slots__ = ()
+    _symbol = '-'
+
+    @classmethod
+    def of(cls, *nodes: LazyMultiset[T]) -> LazyMultiset[T]:
+        first, *rest = nodes
+        if type(first) is cls:
+            return cls((*first._operands, *rest))
+        return cls((first, *rest))
+
+    def _format(self, parts: t.List[str]) -> str:
+        first, *rest = parts
+        if len(rest) > _MAX_CHAIN:
+            return 'max({} - sum(({},)), 0)'.format(first, ', '.join(rest))
+        return 'max({} - {}, 0)'.format(first, ' - '.join(rest))
+
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        return estimates[0]
+
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        return self._operands[:1]
+
+
+class _SymmetricDifference(_Operation[T]):
+    __slots__ = ('_left', '_right')
+
+    def __init__(self, left: LazyMultiset[T], right: LazyMultiset[T]) -> None:
+        self._left = left
+        self._right = right
+
+    def _children(self) -> t.Sequence[LazyMultiset[T]]:
+        return self._left, self._right
+
+    def _format(self, parts: t.List[str]) -> str:
+        return 'abs({} - {})'.format(*parts)
+
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        return sum(estimates)
+
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        return self._left, self._right
+
+    def _describe_from(self, parts: t.List[str]) -> str:
+        return '({} ^ {})'.format(*parts)
+
+
+class _Times(_Operation[T]):
+    __slots__ = ('_operand', '_factor')
+
+    def __init__(self, operand: LazyMultiset[T], factor: int) -> None:
+        self._operand = operand
+        self._factor = factor
+
+    def _children(self) -> t.Sequence[LazyMultiset[T]]:
+        return self._operand,
+
+    def _format(self, parts: t.List[str]) -> str:
+        return '({} * {:d})'.format(parts[0], self._factor)
+
+    def _estimate_from(self, estimates: t.List[int]) -> int:
+        return estimates[0] if self._factor else 0
+
+    def _candidate_operands(self, estimate: t.Callable[[LazyMultiset[T]], int]) -> t.Sequence[LazyMultiset[T]]:
+        return (self._operand,) if self._factor else ()
+
+    def _describe_from(self, parts: t.List[str]) -> str:
+        return '({} * {})'.format(parts[0], self._factor)
+
+
+def _as_mapping(other: t.Iterable[T]) -> t.Mapping[T, int]:
+    if isinstance(other, LazyMultiset):
+        return dict(other.items())
+    return BaseMultiset._as_mapping(other)
+
+
+def _as_node(other: t.Iterable[T]) -> LazyMultiset[T]:
+    if isinstance(other, LazyMultiset):
+        return other
+    if isinstance(other, BaseMultiset):
+        return _Leaf(other, other.__class__)
+    return _Leaf(BaseMultiset._as_mapping(other))
+
+
+def lazy(multiset: t.Iterable[T]) -> LazyMultiset[T]:
+    return _as_node(multiset)
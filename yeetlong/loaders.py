@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import typing as t
+import collections
+import io
+import itertools
+import json
+import os
+import re
+from concurrent.futures import Executor, Future
+
+from yeetlong.multiset import Multiset
+
+
+T = t.TypeVar('T')
+C = t.TypeVar('C')
+
+__all__ = [
+    'DECKLIST',
+    'JSON_LINES',
+    'parse_decklist',
+    'parse_json_line',
+    'load',
+    'load_decklists',
+    'load_json_lines',
+]
+
+DECKLIST = 'decklist'
+JSON_LINES = 'jsonl'
+
+Source = t.Union[str, os.PathLike, t.TextIO, t.Iterable[str]]
+
+_COMMENTS = ('#', '//')
+_DECKLIST_LINE = re.compile(r'(?:(\d+)\s*[xX]?\s+)?(.*?)\s*$')
+
+
+def parse_decklist(lines: t.Iterable[str]) -> t.Dict[str, int]:
+    """
+    Parses the lines of a single decklist, "4 Lightning Bolt" or "4x Lightning Bolt", a line without a
+    count is one copy. Blank lines and lines starting with # or // are ignored.
+    """
+    counts: t.Dict[str, int] = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(_COMMENTS):
+            continue
+        count, name = _DECKLIST_LINE.match(line).groups()
+        if not name:
+            raise ValueError('Invalid decklist line {!r}'.format(line))
+        counts[name] = counts.get(name, 0) + (1 if count is None else int(count))
+    return counts
+
+
+def parse_json_line(line: str) -> t.Dict[str, int]:
+    counts = json.loads(line)
+    if not isinstance(counts, dict):
+        raise ValueError('Expected a json object of counts, got {!r}'.format(line))
+    return counts
+
+
+def _lines(source: Source) -> t.Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        with io.open(source, encoding = 'utf-8') as f:
+            yield from f
+    else:
+        yield from source
+
+
+def _decklist_records(lines: t.Iterable[str]) -> t.Iterator[t.List[str]]:
+    # Blocks of only comments, like a file header, hold no decklist and are dropped.
+    record: t.List[str] = []
+    cards = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            record.append(line)
+            cards = cards or not stripped.startswith(_COMMENTS)
+        elif record:
+            if cards:
+                yield record
+            record = []
+            cards = False
+    if cards:
+        yield record
+
+
+def _json_records(lines: t.Iterable[str]) -> t.Iterator[str]:
+    return (line for line in lines if line.strip())
+
+
+_FORMATS = {
+    DECKLIST: (_decklist_records, parse_decklist),
+    JSON_LINES: (_json_records, parse_json_line),
+}
+
+
+def _parse_chunk(format: str, records: t.List[t.Any]) -> t.List[t.Dict[str, int]]:
+    parse = _FORMATS[format][1]
+    return [parse(record) for record in records]
+
+
+def _chunks(records: t.Iterable[T], chunk_size: int) -> t.Iterator[t.List[T]]:
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load(
+    source: Source,
+    format: str = DECKLIST,
+    cls: t.Callable[[t.Mapping[str, int]], C] = Multiset,
+    chunk_size: int = 1024,
+    executor: t.Optional[Executor] = None,
+    window: int = 8,
+) -> t.Iterator[C]:
+    """
+    Lazily loads collections from a path, file or iterable of lines. Decklists are separated by blank
+    lines, json lines hold one object of counts per line. Records are read and parsed chunk_size at a
+    time, on executor when one is given (a ProcessPoolExecutor parallelizes parsing), with at most window
+    chunks in flight, so only a bounded part of the source is in memory at once. Every parsed count
+    mapping is passed to cls as a whole, and results are yielded in source order.
+    """
+    try:
+        split, _ = _FORMATS[format]
+    except KeyError:
+        raise ValueError('Unknown format {!r}'.format(format))
+    if chunk_size <= 0 or window <= 0:
+        raise ValueError('chunk_size and window must be positive')
+
+    chunks = _chunks(split(_lines(source)), chunk_size)
+
+    if executor is None:
+        for chunk in chunks:
+            for counts in _parse_chunk(format, chunk):
+                yield cls(counts)
+        return
+
+    pending: t.Deque[Future] = collections.deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(_parse_chunk, format, chunk))
+            if len(pending) >= window:
+                for counts in pending.popleft().result():
+                    yield cls(counts)
+        while pending:
+            for counts in pending.popleft().result():
+                yield cls(counts)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def load_decklists(source: Source, cls: t.Callable[[t.Mapping[str, int]], C] = Multiset, **kwargs) -> t.Iterator[C]:
+    return load(source, DECKLIST, cls, **kwargs)
+
+
+def load_json_lines(source: Source, cls: t.Callable[[t.Mapping[str, int]], C] = Multiset, **kwargs) -> t.Iterator[C]:
+    return load(source, JSON_LINES, cls, **kwargs)
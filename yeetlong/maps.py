@@ -4,6 +4,10 @@ import typing as t
 
 import operator
 import collections
+import collections.abc
+import itertools
+
+from yeetlong.fingerprint import items_fingerprint
 
 
 K = t.TypeVar('K')
@@ -11,39 +15,230 @@ V = t.TypeVar('V')
 
 __all__ = [
     'IndexedOrderedDict',
+    'KeysSliceView',
+    'ValuesSliceView',
+    'ItemsSliceView',
+    'StorageKeysView',
+    'StorageValuesView',
+    'StorageItemsView',
     'OrderedDefaultDict',
     'IndexedOrderedDefaultDict',
+    'InsertionOrderedDefaultDict',
 ]
 
 
+class _SliceView(t.Sequence):
+    """
+    Live view of a range of positions of an IndexedOrderedDict. Nothing is copied, the bounds are
+    resolved against the current length of the mapping on every access, like slicing it would be. With
+    attribute, the mapping is read from that attribute of owner on every access instead, so the view
+    follows owners that replace their storage, like copy-on-write multisets.
+    """
+    __slots__ = ('_owner', '_attribute', '_slice')
+
+    def __init__(
+        self,
+        owner: t.Any,
+        start: t.Optional[int] = None,
+        stop: t.Optional[int] = None,
+        attribute: t.Optional[str] = None,
+    ):
+        self._owner = owner
+        self._attribute = attribute
+        self._slice = slice(start, stop)
+
+    @property
+    def _mapping(self) -> IndexedOrderedDict:
+        if self._attribute is None:
+            return self._owner
+        return getattr(self._owner, self._attribute)
+
+    def _range(self) -> range:
+        return range(*self._slice.indices(len(self._mapping._list)))
+
+    def _at(self, index: int):
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        return len(self._range())
+
+    def __getitem__(self, index):
+        positions = self._range()[index]
+        if isinstance(positions, range):
+            return list(map(self._at, positions))
+        return self._at(positions)
+
+    def __iter__(self):
+        return map(self._at, self._range())
+
+    def __reversed__(self):
+        return map(self._at, reversed(self._range()))
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(
+            self.__class__.__name__,
+            list(self),
+        )
+
+
+class KeysSliceView(_SliceView):
+    __slots__ = ()
+
+    def _at(self, index: int):
+        return self._mapping._list[index]
+
+    def __iter__(self):
+        positions = self._range()
+        return itertools.islice(self._mapping._list, positions.start, positions.stop)
+
+
+class ValuesSliceView(_SliceView):
+    __slots__ = ()
+
+    def _at(self, index: int):
+        mapping = self._mapping
+        return mapping._dict[mapping._list[index]]
+
+
+class ItemsSliceView(_SliceView):
+    __slots__ = ()
+
+    def _at(self, index: int):
+        mapping = self._mapping
+        key = mapping._list[index]
+        return key, mapping._dict[key]
+
+
+class StorageKeysView(collections.abc.KeysView):
+    """
+    Keys view of the current _elements of owner, which copy-on-write collections replace on their first
+    write after a copy or snapshot, so a view of the storage itself would go stale.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: t.Any) -> None:
+        self._owner = owner
+
+    @property
+    def _mapping(self) -> t.Mapping:
+        return self._owner._elements
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._owner._elements
+
+    def __iter__(self) -> t.Iterator[K]:
+        return iter(self._owner._elements)
+
+    def __reversed__(self) -> t.Iterator[K]:
+        return reversed(self._owner._elements.keys())
+
+
+class StorageValuesView(collections.abc.ValuesView):
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: t.Any) -> None:
+        self._owner = owner
+
+    @property
+    def _mapping(self) -> t.Mapping:
+        return self._owner._elements
+
+    def __iter__(self) -> t.Iterator[V]:
+        return iter(self._owner._elements.values())
+
+    def __reversed__(self) -> t.Iterator[V]:
+        return reversed(self._owner._elements.values())
+
+
+class StorageItemsView(collections.abc.ItemsView):
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: t.Any) -> None:
+        self._owner = owner
+
+    @property
+    def _mapping(self) -> t.Mapping:
+        return self._owner._elements
+
+    def __contains__(self, item: t.Tuple[K, V]) -> bool:
+        key, value = item
+        _elements = self._owner._elements
+        return key in _elements and _elements[key] == value
+
+    def __iter__(self) -> t.Iterator[t.Tuple[K, V]]:
+        return iter(self._owner._elements.items())
+
+    def __reversed__(self) -> t.Iterator[t.Tuple[K, V]]:
+        return reversed(self._owner._elements.items())
+
+
+class _IndexedKeysView(collections.abc.KeysView):
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._mapping._dict
+
+    def __iter__(self) -> t.Iterator[K]:
+        return iter(self._mapping._list)
+
+    def __reversed__(self) -> t.Iterator[K]:
+        return reversed(self._mapping._list)
+
+
+class _IndexedValuesView(collections.abc.ValuesView):
+
+    def __iter__(self) -> t.Iterator[V]:
+        return map(self._mapping._dict.__getitem__, self._mapping._list)
+
+
+class _IndexedItemsView(collections.abc.ItemsView):
+
+    def __contains__(self, item: t.Tuple[K, V]) -> bool:
+        key, value = item
+        _dict = self._mapping._dict
+        return key in _dict and _dict[key] == value
+
+    def __iter__(self) -> t.Iterator[t.Tuple[K, V]]:
+        _dict = self._mapping._dict
+        return ((key, _dict[key]) for key in self._mapping._list)
+
+
 class IndexedOrderedDict(t.MutableMapping[K, V]):
-    __slots__ = ('_list', '_dict')
+    __slots__ = ('_list', '_dict', '_fingerprint')
 
     def __init__(self, initial: t.Iterable[t.Tuple[K, V]] = ()):
         self._dict = {}
         self._list = []
+        self._fingerprint = None
         self.update(initial)
 
     def __setitem__(self, key: K, value: V) -> None:
-        if key not in self._list:
+        if key not in self._dict:
             self._list.append(key)
         self._dict.__setitem__(key, value)
+        self._fingerprint = None
 
     def __delitem__(self, key: K) -> None:
         self._dict.__delitem__(key)
         self._list.remove(key)
+        self._fingerprint = None
 
     def __getitem__(self, key: K) -> V:
         return self._dict.__getitem__(key)
 
+    def __contains__(self, key: K) -> bool:
+        return key in self._dict
+
+    def get(self, key: K, default: t.Optional[V] = None) -> t.Optional[V]:
+        return self._dict.get(key, default)
+
     def keys(self) -> t.AbstractSet[K]:
-        return self._dict.keys()
+        return _IndexedKeysView(self)
 
     def values(self) -> t.ValuesView[V]:
-        return self._dict.values()
+        return _IndexedValuesView(self)
 
     def items(self) -> t.AbstractSet[t.Tuple[K, V]]:
-        return self._dict.items()
+        return _IndexedItemsView(self)
 
     def __len__(self) -> int:
         return len(self._list)
@@ -57,10 +252,12 @@ class IndexedOrderedDict(t.MutableMapping[K, V]):
     def clear(self):
         self._list[:] = []
         self._dict.clear()
+        self._fingerprint = None
 
     def popitem(self, last = True):
         key = self._list.pop() if last else self._list.pop(0)
         value = self._dict.pop(key)
+        self._fingerprint = None
         return key, value
 
     def move_to_end(self, key, last = True):
@@ -69,6 +266,7 @@ class IndexedOrderedDict(t.MutableMapping[K, V]):
             self._list.append(key)
         else:
             self._list.insert(0, key)
+        self._fingerprint = None
 
     def get_key_by_index(self, index: int) -> K:
         return self._list[index]
@@ -79,6 +277,60 @@ class IndexedOrderedDict(t.MutableMapping[K, V]):
     def get_index_of_key(self, key: K) -> int:
         return self._list.index(key)
 
+    def keys_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> KeysSliceView:
+        return KeysSliceView(self, start, stop)
+
+    def values_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> ValuesSliceView:
+        return ValuesSliceView(self, start, stop)
+
+    def items_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> ItemsSliceView:
+        return ItemsSliceView(self, start, stop)
+
+    def sort(self, key: t.Optional[t.Callable[[t.Tuple[K, V]], t.Any]] = None, reverse: bool = False) -> None:
+        """
+        Reorders the keys in place with a single sort. Like sorted(mapping.items(), key=key), key is given
+        (key, value) pairs, without it the keys themselves are compared.
+        """
+        if key is None:
+            self._list.sort(reverse = reverse)
+        else:
+            _dict = self._dict
+            self._list.sort(key = lambda k: key((k, _dict[k])), reverse = reverse)
+        self._fingerprint = None
+
+    def reverse(self) -> None:
+        self._list.reverse()
+        self._fingerprint = None
+
+    def insert_at(self, index: int, items: t.Union[t.Mapping[K, V], t.Iterable[t.Tuple[K, V]]]) -> None:
+        """
+        Inserts items so that the first of them ends up at index, in one pass over the keys. Keys that are
+        already present are moved there and take the new value, index counts the keys that stay in place.
+        """
+        if isinstance(items, t.Mapping):
+            items = list(items.items())
+        else:
+            items = list(items)
+        keys = list(dict.fromkeys(key for key, _ in items))
+
+        moved = {key for key in keys if key in self._dict}
+        if moved:
+            self._list[:] = [key for key in self._list if key not in moved]
+
+        length = len(self._list)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+
+        self._list[index:index] = keys
+        self._dict.update(items)
+        self._fingerprint = None
+
+    def fingerprint(self) -> int:
+        if self._fingerprint is None:
+            self._fingerprint = items_fingerprint((key, self._dict[key]) for key in self._list)
+        return self._fingerprint
+
     _marker = object()
 
     def pop(self, key, default = _marker):
@@ -106,12 +358,16 @@ class IndexedOrderedDict(t.MutableMapping[K, V]):
         return self.__class__, (), None, None, iter(self.items())
 
     def copy(self) -> IndexedOrderedDict:
-        return self.__class__(self)
+        result = self.__class__.__new__(self.__class__)
+        result._dict = self._dict.copy()
+        result._list = self._list.copy()
+        result._fingerprint = self._fingerprint
+        return result
 
     __copy__ = copy
 
     def __eq__(self, other: t.Mapping) -> bool:
-        if isinstance(other, collections.OrderedDict) or isinstance(other, IndexedOrderedDict):
+        if isinstance(other, (collections.OrderedDict, IndexedOrderedDict, InsertionOrderedDefaultDict)):
             return self._dict.__eq__(other) and all(map(operator.eq, self, other))
         return self._dict.__eq__(other)
 
@@ -154,3 +410,40 @@ class IndexedOrderedDefaultDict(DefaultMixin, IndexedOrderedDict):
     def __init__(self, default_factory: t.Callable[[], V], initial: t.Iterable[t.Tuple[K, V]] = ()):
         IndexedOrderedDict.__init__(self, initial)
         DefaultMixin.__init__(self, default_factory)
+
+    def __reduce__(self):
+        return self.__class__, (self._default_factory,), None, None, iter(self.items())
+
+    def copy(self) -> IndexedOrderedDefaultDict:
+        result = IndexedOrderedDict.copy(self)
+        result._default_factory = self._default_factory
+        return result
+
+    __copy__ = copy
+
+
+class InsertionOrderedDefaultDict(collections.defaultdict):
+    __slots__ = ()
+
+    def __init__(self, default_factory: t.Callable[[], V], initial: t.Iterable[t.Tuple[K, V]] = ()):
+        super().__init__(default_factory, initial)
+
+    def __eq__(self, other: t.Mapping) -> bool:
+        if isinstance(other, IndexedOrderedDict):
+            return other.__eq__(self)
+        if isinstance(other, collections.OrderedDict) or isinstance(other, InsertionOrderedDefaultDict):
+            return dict.__eq__(self, other) and all(map(operator.eq, self, other))
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: t.Mapping) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return '{}({}, {})'.format(
+            self.__class__.__name__,
+            self.default_factory,
+            list(self.items()),
+        )
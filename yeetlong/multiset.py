@@ -11,7 +11,18 @@ import copy
 
 from collections import defaultdict
 
-from yeetlong.maps import OrderedDefaultDict, IndexedOrderedDefaultDict
+from yeetlong.maps import (
+    InsertionOrderedDefaultDict,
+    IndexedOrderedDefaultDict,
+    ItemsSliceView,
+    KeysSliceView,
+    ValuesSliceView,
+    StorageItemsView,
+    StorageKeysView,
+    StorageValuesView,
+)
+from yeetlong.compact import CompactCounts, compact
+from yeetlong.fingerprint import combine_fingerprints, counts_fingerprint, scale_fingerprint
 
 
 T = t.TypeVar('T')
@@ -117,7 +128,7 @@ class BaseMultiset(t.AbstractSet[T]):
 
     def difference(self, *others: t.Iterable[T]) -> BaseMultiset[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -138,7 +149,7 @@ class BaseMultiset(t.AbstractSet[T]):
 
     def union(self, *others: t.Iterable[T]) -> BaseMultiset[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -154,7 +165,7 @@ class BaseMultiset(t.AbstractSet[T]):
 
     def combine(self, *others: t.Iterable[T]) -> BaseMultiset[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -171,7 +182,7 @@ class BaseMultiset(t.AbstractSet[T]):
 
     def intersection(self, *others: t.Iterable[T]) -> BaseMultiset[T]:
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in list(_elements.items()):
@@ -220,7 +231,7 @@ class BaseMultiset(t.AbstractSet[T]):
         if factor < 0:
             raise ValueError('The factor must no be negative.')
         result = self.__copy__()
-        _elements = result._elements
+        _elements = result._writable_elements()
         for element in _elements:
             _elements[element] *= factor
         return result
@@ -296,6 +307,9 @@ class BaseMultiset(t.AbstractSet[T]):
     def __copy__(self) -> BaseMultiset[T]:
         return self.__class__(self)
 
+    def _writable_elements(self) -> t.MutableMapping[T, int]:
+        return self._elements
+
     def items(self) -> t.Iterable[t.Tuple[T, int]]:
         return self._elements.items()
 
@@ -341,10 +355,10 @@ class BaseOrderedMultiset(BaseMultiset[T]):
 
     def __init__(self, iterable: t.Optional[t.Iterable[T]] = None) -> None:
         if isinstance(iterable, __class__):
-            self._elements = copy.copy(iterable._elements)
+            self._elements = iterable._elements.copy()
             return
 
-        self._elements: OrderedDefaultDict[T, int] = OrderedDefaultDict(int)
+        self._elements: InsertionOrderedDefaultDict[T, int] = InsertionOrderedDefaultDict(int)
 
         if iterable is not None:
 
@@ -388,12 +402,70 @@ class BaseIndexedOrderedMultiset(BaseOrderedMultiset[T]):
     def get_index_of_item(self, item: T) -> int:
         return self._elements.get_index_of_key(item)
 
+    def elements_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> KeysSliceView:
+        return KeysSliceView(self, start, stop, '_elements')
+
+    def multiplicities_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> ValuesSliceView:
+        return ValuesSliceView(self, start, stop, '_elements')
+
+    def items_slice(self, start: t.Optional[int] = None, stop: t.Optional[int] = None) -> ItemsSliceView:
+        return ItemsSliceView(self, start, stop, '_elements')
+
 
 class Multiset(BaseMultiset[T]):
-    __slots__ = ()
+    """
+    Mutable multiset whose storage may be shared copy-on-write: copies and snapshots share the elements
+    until either side is written, and the writer then copies them first.
+    """
+    __slots__ = ('_shared',)
+
+    _frozen_class: t.ClassVar[t.Type[FrozenMultiset]]
+
+    def __init__(self, iterable: t.Union[t.Iterable[t.Tuple[T, int]], t.Mapping[T, int], t.Iterable[T]] = None) -> None:
+        if type(iterable) is self.__class__:
+            self._elements = iterable._elements
+            self._shared = iterable._shared = True
+            return
+        super().__init__(iterable)
+        self._shared = False
+
+    def _writable_elements(self) -> t.MutableMapping[T, int]:
+        if self._shared:
+            self._elements = self._elements.copy()
+            self._shared = False
+        return self._elements
+
+    def snapshot(self) -> FrozenMultiset[T]:
+        result = self._frozen_class.__new__(self._frozen_class)
+        result._elements = self._elements
+        self._shared = True
+        return result
+
+    freeze = snapshot
+
+    # The storage is replaced on the first write after sharing it, so views go through self.
+    def items(self) -> t.ItemsView[T, int]:
+        return StorageItemsView(self)
+
+    def distinct_elements(self) -> t.KeysView[T]:
+        return StorageKeysView(self)
+
+    def multiplicities(self) -> t.ValuesView[int]:
+        return StorageValuesView(self)
+
+    values = multiplicities
+
+    def __copy__(self) -> Multiset[T]:
+        return self.__class__(self)
+
+    copy = __copy__
+
+    def __setstate__(self, state):
+        self._elements = state
+        self._shared = False
 
     def __setitem__(self, element: T, multiplicity: int) -> None:
-        _elements = self._elements
+        _elements = self._writable_elements()
         if element in _elements:
             if multiplicity > 0:
                 _elements[element] = multiplicity
@@ -404,19 +476,21 @@ class Multiset(BaseMultiset[T]):
 
     def __delitem__(self, element: T) -> None:
         if element in self._elements:
-            del self._elements[element]
+            del self._writable_elements()[element]
         else:
             raise KeyError("Could not delete {!r} from the multiset, because it is not in it.".format(element))
 
     def update(self, *others: t.Iterable[T]) -> Multiset[T]:
+        _elements = self._writable_elements()
+
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
-                self._elements[element] += multiplicity
+                _elements[element] += multiplicity
 
         return self
 
     def union_update(self, *others: t.Iterable[T]) -> Multiset[T]:
-        _elements = self._elements
+        _elements = self._writable_elements()
 
         for other in map(self._as_mapping, others):
             for element, multiplicity in other.items():
@@ -431,7 +505,7 @@ class Multiset(BaseMultiset[T]):
 
     def intersection_update(self, *others: t.Iterable[T]) -> Multiset[T]:
         for other in map(self._as_mapping, others):
-            for element, current_count in self.items():
+            for element, current_count in list(self.items()):
                 multiplicity = other.get(element, 0)
                 if multiplicity < current_count:
                     self[element] = multiplicity
@@ -470,7 +544,7 @@ class Multiset(BaseMultiset[T]):
         elif factor == 0:
             self.clear()
         else:
-            _elements = self._elements
+            _elements = self._writable_elements()
             for element in _elements:
                 _elements[element] *= factor
 
@@ -482,14 +556,14 @@ class Multiset(BaseMultiset[T]):
     def add(self, element: T, multiplicity = 1) -> Multiset[T]:
         if multiplicity < 1:
             raise ValueError("Multiplicity must be positive")
-        self._elements[element] += multiplicity
+        self._writable_elements()[element] += multiplicity
 
         return self
 
     def remove(self, element: T, multiplicity: t.Optional[int] = None) -> int:
-        _elements = self._elements
-        if element not in _elements:
+        if element not in self._elements:
             raise KeyError
+        _elements = self._writable_elements()
         old_multiplicity = _elements.get(element, 0)
         if multiplicity is None or multiplicity >= old_multiplicity:
             del _elements[element]
@@ -500,8 +574,8 @@ class Multiset(BaseMultiset[T]):
         return old_multiplicity
 
     def discard(self, element: T, multiplicity: t.Optional[int] = None) -> int:
-        _elements = self._elements
-        if element in _elements:
+        if element in self._elements:
+            _elements = self._writable_elements()
             old_multiplicity = _elements[element]
             if multiplicity is None or multiplicity >= old_multiplicity:
                 del _elements[element]
@@ -514,10 +588,16 @@ class Multiset(BaseMultiset[T]):
             return 0
 
     def pop(self, element: T, default: t.Optional[V] = None) -> t.Union[int, V, None]:
-        return self._elements.pop(element, default)
+        if element not in self._elements:
+            return default
+        return self._writable_elements().pop(element)
 
     def clear(self) -> BaseMultiset[T]:
-        self._elements.clear()
+        if self._shared:
+            self._elements = self.__class__()._elements
+            self._shared = False
+        else:
+            self._elements.clear()
         return self
 
 
@@ -528,15 +608,89 @@ class OrderedMultiset(Multiset[T], BaseOrderedMultiset[T]):
 class IndexedOrderedMultiset(Multiset[T], BaseIndexedOrderedMultiset[T]):
     __slots__ = ()
 
+    def sort(self, key: t.Optional[t.Callable[[t.Tuple[T, int]], t.Any]] = None, reverse: bool = False) -> None:
+        self._writable_elements().sort(key, reverse)
+
+    def reverse(self) -> None:
+        self._writable_elements().reverse()
+
+    def insert_at(self, index: int, items: t.Union[t.Mapping[T, int], t.Iterable[t.Tuple[T, int]]]) -> None:
+        """
+        See IndexedOrderedDict.insert_at. Elements given a multiplicity of zero or less are removed instead,
+        as when setting them, before index is applied.
+        """
+        items = dict(items.items() if isinstance(items, t.Mapping) else items)
+        _elements = self._writable_elements()
+        for element, multiplicity in items.items():
+            if multiplicity <= 0 and element in _elements:
+                del _elements[element]
+        _elements.insert_at(
+            index,
+            [(element, multiplicity) for element, multiplicity in items.items() if multiplicity > 0],
+        )
+
 
 class FrozenMultiset(BaseMultiset[T]):
-    __slots__ = ('_hash',)
+    __slots__ = ('_hash', '_fingerprint')
+
+    def __init__(self, iterable: t.Union[t.Iterable[t.Tuple[T, int]], t.Mapping[T, int], t.Iterable[T]] = None) -> None:
+        if type(iterable) is self.__class__ and isinstance(iterable._elements, CompactCounts):
+            self._elements = iterable._elements
+            return
+        super().__init__(iterable)
+
+    def __copy__(self) -> FrozenMultiset[T]:
+        if not isinstance(self._elements, (defaultdict, CompactCounts)):
+            return super().__copy__()
+        result = self.__class__.__new__(self.__class__)
+        result._elements = self._elements.copy()
+        return result
+
+    def compact(self, threshold: t.Optional[int] = None) -> FrozenMultiset[T]:
+        """
+        Copy of this multiset in the packed storage of yeetlong.compact, which takes less memory but looks
+        elements up by a linear scan, for keeping many small multisets that are rarely queried. Returns
+        self when it has more than threshold (COMPACT_THRESHOLD) distinct elements, multiplicities outside
+        -128..127 or ordered storage.
+        """
+        if type(self._elements) is not defaultdict:
+            return self
+        _elements = compact(self._elements, threshold)
+        if _elements is self._elements:
+            return self
+        result = self.__class__.__new__(self.__class__)
+        result._elements = _elements
+        return result
 
     def __hash__(self) -> int:
         if not hasattr(self, '_hash') or self._hash is None:
             self._hash = hash(frozenset(self._elements.items()))
         return self._hash
 
+    def fingerprint(self) -> int:
+        if not hasattr(self, '_fingerprint') or self._fingerprint is None:
+            self._fingerprint = counts_fingerprint(self._elements.items())
+        return self._fingerprint
+
+    def combine(self, *others: t.Iterable[T]) -> BaseMultiset[T]:
+        result = super().combine(*others)
+        if (
+            getattr(self, '_fingerprint', None) is not None
+            and isinstance(result, FrozenMultiset)
+            and all(isinstance(other, FrozenMultiset) for other in others)
+        ):
+            result._fingerprint = combine_fingerprints(
+                self._fingerprint,
+                *(other.fingerprint() for other in others)
+            )
+        return result
+
+    def times(self, factor: int) -> BaseMultiset[T]:
+        result = super().times(factor)
+        if getattr(self, '_fingerprint', None) is not None and isinstance(result, FrozenMultiset):
+            result._fingerprint = scale_fingerprint(self._fingerprint, factor)
+        return result
+
 
 class FrozenOrderedMultiset(FrozenMultiset[T], BaseOrderedMultiset[T]):
     __slots__ = ()
@@ -544,3 +698,8 @@ class FrozenOrderedMultiset(FrozenMultiset[T], BaseOrderedMultiset[T]):
 
 class FrozenIndexedOrderedMultiset(FrozenMultiset[T], BaseIndexedOrderedMultiset[T]):
     __slots__ = ()
+
+
+Multiset._frozen_class = FrozenMultiset
+OrderedMultiset._frozen_class = FrozenOrderedMultiset
+IndexedOrderedMultiset._frozen_class = FrozenIndexedOrderedMultiset
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import typing as t
+import threading
+from collections import OrderedDict
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'CacheInfo',
+    'OperationCache',
+]
+
+_OPERATIONS = frozenset((
+    'combine',
+    'union',
+    'intersection',
+    'difference',
+    'symmetric_difference',
+    'times',
+    'issubset',
+    'issuperset',
+    'isdisjoint',
+))
+
+_MISSING = object()
+
+
+class CacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+
+class OperationCache(object):
+    """
+    Bounded, thread safe LRU cache of binary operations between frozen multisets and counters. Entries
+    are keyed on the operation and the type and value of each operand, so lookups hash the operands
+    (which frozen collections cache) and only compare them by value when the hashes match and they are
+    not the same objects. Results are shared between callers, which is safe as long as operands and
+    results are frozen. Operands that are not hashable bypass the cache.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive')
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[t.Tuple[t.Any, ...], t.Any] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def apply(self, operation: str, first: t.Any, *others: t.Any) -> t.Any:
+        if operation not in _OPERATIONS:
+            raise ValueError('Unknown operation {!r}'.format(operation))
+
+        key = (operation, type(first), first)
+        for other in others:
+            key += (type(other), other)
+
+        try:
+            hash(key)
+        except TypeError:
+            return getattr(first, operation)(*others)
+
+        with self._lock:
+            result = self._entries.get(key, _MISSING)
+            if result is not _MISSING:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return result
+
+        result = getattr(first, operation)(*others)
+
+        with self._lock:
+            self._misses += 1
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last = False)
+
+        return result
+
+    def combine(self, first: t.Any, *others: t.Any) -> t.Any:
+        return self.apply('combine', first, *others)
+
+    def union(self, first: t.Any, *others: t.Any) -> t.Any:
+        return self.apply('union', first, *others)
+
+    def intersection(self, first: t.Any, *others: t.Any) -> t.Any:
+        return self.apply('intersection', first, *others)
+
+    def difference(self, first: t.Any, *others: t.Any) -> t.Any:
+        return self.apply('difference', first, *others)
+
+    def symmetric_difference(self, first: t.Any, other: t.Any) -> t.Any:
+        return self.apply('symmetric_difference', first, other)
+
+    def times(self, first: t.Any, factor: int) -> t.Any:
+        return self.apply('times', first, factor)
+
+    def issubset(self, first: t.Any, other: t.Any) -> bool:
+        return self.apply('issubset', first, other)
+
+    def issuperset(self, first: t.Any, other: t.Any) -> bool:
+        return self.apply('issuperset', first, other)
+
+    def isdisjoint(self, first: t.Any, other: t.Any) -> bool:
+        return self.apply('isdisjoint', first, other)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import typing as t
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+
+__all__ = [
+    'ENVIRONMENT_VARIABLE',
+    'MethodStats',
+    'enable',
+    'disable',
+    'is_enabled',
+    'profile',
+    'reset',
+    'snapshot',
+    'export_json',
+]
+
+ENVIRONMENT_VARIABLE = 'YEETLONG_PROFILE'
+
+_MODULES = (
+    'yeetlong.multiset',
+    'yeetlong.counters',
+    'yeetlong.maps',
+)
+
+_EXCLUDED = frozenset(
+    (
+        '__repr__',
+        '__str__',
+        '__getstate__',
+        '__setstate__',
+        '__reduce__',
+        '__class_getitem__',
+        '__init_subclass__',
+    )
+)
+
+
+def _size(value: t.Any) -> t.Optional[int]:
+    for attribute in ('_elements', '_dict'):
+        inner = getattr(value, attribute, None)
+        if inner is not None:
+            return _size(inner)
+    if isinstance(value, t.Sized):
+        return len(value)
+    return None
+
+
+def _bucket(size: int) -> int:
+    return 1 << size.bit_length() >> 1
+
+
+class MethodStats(object):
+    __slots__ = ('calls', 'cumulative_time', 'self_sizes', 'operand_sizes')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cumulative_time = 0.
+        self.self_sizes: t.DefaultDict[int, int] = defaultdict(int)
+        self.operand_sizes: t.DefaultDict[int, int] = defaultdict(int)
+
+    def as_dict(self) -> t.Mapping[str, t.Any]:
+        return {
+            'calls': self.calls,
+            'cumulative_time': self.cumulative_time,
+            'self_sizes': dict(sorted(self.self_sizes.items())),
+            'operand_sizes': dict(sorted(self.operand_sizes.items())),
+        }
+
+    def __repr__(self) -> str:
+        return '{}({}, {:.6f})'.format(
+            self.__class__.__name__,
+            self.calls,
+            self.cumulative_time,
+        )
+
+
+_lock = threading.Lock()
+_stats: t.DefaultDict[t.Tuple[str, str], MethodStats] = defaultdict(MethodStats)
+_originals: t.List[t.Tuple[type, str, t.Callable]] = []
+_depth = 0
+# (object id, method name) pairs being recorded by the current thread, so an override calling the
+# method it overrides through super() records the one call once.
+_active = threading.local()
+
+
+def _record(class_name: str, method_name: str, elapsed: float, args: t.Sequence[t.Any]) -> None:
+    self_size = _size(args[0]) if args else None
+    operand_sizes = [size for size in map(_size, args[1:]) if size is not None]
+    with _lock:
+        stats = _stats[class_name, method_name]
+        stats.calls += 1
+        stats.cumulative_time += elapsed
+        if self_size is not None:
+            stats.self_sizes[_bucket(self_size)] += 1
+        for size in operand_sizes:
+            stats.operand_sizes[_bucket(size)] += 1
+
+
+def _instrument(function: t.Callable, method_name: str) -> t.Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        try:
+            active = _active.keys
+        except AttributeError:
+            active = _active.keys = set()
+        key = (id(args[0]) if args else None, method_name)
+        if key in active:
+            return function(*args, **kwargs)
+
+        active.add(key)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            active.discard(key)
+            _record(
+                args[0].__class__.__name__ if args else '',
+                method_name,
+                elapsed,
+                args,
+            )
+
+    wrapper.__yeetlong_profiled__ = True
+    return wrapper
+
+
+def _instrumented_classes() -> t.Iterator[type]:
+    import importlib
+
+    for module_name in _MODULES:
+        module = importlib.import_module(module_name)
+        for value in vars(module).values():
+            if inspect.isclass(value) and value.__module__ == module_name:
+                yield value
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable() -> None:
+    global _depth
+    with _lock:
+        _depth += 1
+        if _originals:
+            return
+        for cls in _instrumented_classes():
+            for name, value in list(vars(cls).items()):
+                if name in _EXCLUDED or not inspect.isfunction(value):
+                    continue
+                if getattr(value, '__yeetlong_profiled__', False):
+                    continue
+                _originals.append((cls, name, value))
+                setattr(cls, name, _instrument(value, name))
+
+
+def disable() -> None:
+    global _depth
+    with _lock:
+        _depth = max(_depth - 1, 0)
+        if _depth:
+            return
+        while _originals:
+            cls, name, value = _originals.pop()
+            setattr(cls, name, value)
+
+
+@contextlib.contextmanager
+def profile(clear: bool = True) -> t.Iterator[t.Mapping[t.Tuple[str, str], MethodStats]]:
+    if clear:
+        reset()
+    enable()
+    try:
+        yield _stats
+    finally:
+        disable()
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> t.Mapping[str, t.Mapping[str, t.Mapping[str, t.Any]]]:
+    result: t.Dict[str, t.Dict[str, t.Mapping[str, t.Any]]] = defaultdict(dict)
+    with _lock:
+        for (class_name, method_name), stats in sorted(_stats.items()):
+            result[class_name][method_name] = stats.as_dict()
+    return dict(result)
+
+
+def export_json(f: t.TextIO, **kwargs) -> None:
+    json.dump(snapshot(), f, **kwargs)
+
+
+if os.environ.get(ENVIRONMENT_VARIABLE, '').lower() not in ('', '0', 'false', 'no'):
+    enable()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import typing as t
+import pickle
+import struct
+import sys
+from collections import defaultdict
+from multiprocessing import shared_memory
+
+from yeetlong.compact import ReadOnlyCounts
+from yeetlong.counters import BaseCounter, FrozenCounter
+from yeetlong.fingerprint import element_digest
+from yeetlong.multiset import BaseMultiset, FrozenMultiset
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'SharedCounts',
+    'SharedFrozenMultiset',
+    'SharedFrozenCounter',
+    'publish',
+    'attach',
+]
+
+_MAGIC = b'YLSM'
+_MULTISET = 0
+_COUNTER = 1
+_PROTOCOL = 4
+
+_HEADER = struct.Struct('<4sB3xQQQ')
+_ENTRY = struct.Struct('<QQQq')
+_SLOT_SIZE = 8
+_EMPTY = -1
+_HASH_MASK = (1 << 64) - 1
+
+
+def _hash(element: t.Any) -> int:
+    return element_digest(element) & _HASH_MASK
+
+
+def _table_size(size: int) -> int:
+    table_size = 8
+    while table_size < size * 2:
+        table_size <<= 1
+    return table_size
+
+
+class SharedCounts(ReadOnlyCounts):
+    """
+    Read only element -> count mapping over a shared memory block written by publish. Elements are
+    stored pickled in an open addressing hash table keyed on their canonical digest (see fingerprint),
+    which is equal for equal elements, 1, 1.0 and True included. A lookup only unpickles the entries
+    whose digest matches and confirms them with ==. Only elements the canonical encoding supports (None,
+    numbers, str, bytes, tuples, lists, sets, mappings and fingerprinted collections) can be published.
+    """
+    __slots__ = ('_shared_memory', '_buffer', '_table', '_kind', '_size', '_entries_offset', '_blob_offset')
+
+    def __init__(self, shared: shared_memory.SharedMemory) -> None:
+        self._shared_memory = shared
+        self._buffer = shared.buf.toreadonly()
+        magic, self._kind, self._size, table_size, _ = _HEADER.unpack_from(self._buffer)
+        if magic != _MAGIC:
+            raise ValueError('{!r} does not hold a published collection'.format(shared.name))
+        table_offset = _HEADER.size
+        self._entries_offset = table_offset + table_size * _SLOT_SIZE
+        self._blob_offset = self._entries_offset + self._size * _ENTRY.size
+        self._table = self._buffer[table_offset:self._entries_offset].cast('q')
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    def _release(self) -> None:
+        for view in (getattr(self, '_table', None), getattr(self, '_buffer', None)):
+            if view is not None:
+                view.release()
+
+    def close(self) -> None:
+        self._release()
+        self._shared_memory.close()
+
+    def __del__(self) -> None:
+        self._release()
+
+    def _entry(self, index: int) -> t.Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._buffer, self._entries_offset + index * _ENTRY.size)
+
+    def _entries(self) -> t.Iterator[t.Tuple[int, int, int, int]]:
+        return map(self._entry, range(self._size))
+
+    def _element(self, offset: int, length: int) -> T:
+        start = self._blob_offset + offset
+        return pickle.loads(self._buffer[start:start + length])
+
+    def _items(self) -> t.Iterator[t.Tuple[T, int]]:
+        for _, offset, length, count in self._entries():
+            yield self._element(offset, length), count
+
+    def _values(self) -> t.Iterator[int]:
+        return (entry[3] for entry in self._entries())
+
+    def _lookup(self, element: T) -> t.Optional[int]:
+        try:
+            key_hash = _hash(element)
+        except TypeError:
+            return None
+        table = self._table
+        mask = len(table) - 1
+        slot = key_hash & mask
+        while True:
+            index = table[slot]
+            if index == _EMPTY:
+                return None
+            entry_hash, offset, length, count = self._entry(index)
+            if entry_hash == key_hash and self._element(offset, length) == element:
+                return count
+            slot = (slot + 1) & mask
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return '{}({!r}, {})'.format(
+            self.__class__.__name__,
+            self.name,
+            dict(self._items()),
+        )
+
+    def __reduce__(self):
+        return defaultdict, (int, dict(self._items()))
+
+
+class SharedFrozenMultiset(FrozenMultiset[T]):
+    __slots__ = ()
+
+    def __copy__(self) -> FrozenMultiset[T]:
+        result = FrozenMultiset.__new__(FrozenMultiset)
+        result._elements = self._elements.copy()
+        return result
+
+    def close(self) -> None:
+        if isinstance(self._elements, SharedCounts):
+            self._elements.close()
+
+    def __enter__(self) -> SharedFrozenMultiset[T]:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        return FrozenMultiset, (dict(self._elements.items()),)
+
+
+class SharedFrozenCounter(FrozenCounter[T]):
+    __slots__ = ()
+
+    def copy(self) -> FrozenCounter[T]:
+        result = FrozenCounter.__new__(FrozenCounter)
+        result._elements = self._elements.copy()
+        return result
+
+    __copy__ = copy
+
+    def close(self) -> None:
+        if isinstance(self._elements, SharedCounts):
+            self._elements.close()
+
+    def __enter__(self) -> SharedFrozenCounter[T]:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __reduce__(self):
+        return FrozenCounter, (dict(self._elements.items()),)
+
+
+def publish(
+    collection: t.Union[BaseMultiset[T], BaseCounter[T]],
+    name: t.Optional[str] = None,
+) -> shared_memory.SharedMemory:
+    kind = _COUNTER if isinstance(collection, BaseCounter) else _MULTISET
+    elements = list(collection.distinct_elements())
+    hashes = list(map(_hash, elements))
+    keys = [pickle.dumps(element, protocol = _PROTOCOL) for element in elements]
+    counts = list(collection.multiplicities())
+    size = len(keys)
+    table_size = _table_size(size)
+    blob_size = sum(map(len, keys))
+    table_offset = _HEADER.size
+    entries_offset = table_offset + table_size * _SLOT_SIZE
+    blob_offset = entries_offset + size * _ENTRY.size
+
+    shared = shared_memory.SharedMemory(name = name, create = True, size = max(blob_offset + blob_size, 1))
+    try:
+        buffer = shared.buf
+        _HEADER.pack_into(buffer, 0, _MAGIC, kind, size, table_size, blob_size)
+        table = buffer[table_offset:entries_offset].cast('q')
+        try:
+            for slot in range(table_size):
+                table[slot] = _EMPTY
+            mask = table_size - 1
+            offset = 0
+            for index, (key_hash, key, count) in enumerate(zip(hashes, keys, counts)):
+                _ENTRY.pack_into(buffer, entries_offset + index * _ENTRY.size, key_hash, offset, len(key), count)
+                buffer[blob_offset + offset:blob_offset + offset + len(key)] = key
+                offset += len(key)
+                slot = key_hash & mask
+                while table[slot] != _EMPTY:
+                    slot = (slot + 1) & mask
+                table[slot] = index
+        finally:
+            table.release()
+    except BaseException:
+        shared.close()
+        shared.unlink()
+        raise
+    return shared
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name = name, track = False)
+    # Before 3.13 attaching always registers the block with the resource tracker. Worker processes
+    # share the tracker of the process that published the block, so this is harmless there.
+    return shared_memory.SharedMemory(name = name)
+
+
+def attach(name: str) -> t.Union[SharedFrozenMultiset[T], SharedFrozenCounter[T]]:
+    counts = SharedCounts(_open(name))
+    cls = SharedFrozenCounter if counts._kind == _COUNTER else SharedFrozenMultiset
+    result = cls.__new__(cls)
+    result._elements = counts
+    return result
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import typing as t
+import heapq
+import random
+from collections import defaultdict
+
+from yeetlong.multiset import BaseMultiset, FrozenMultiset
+
+
+T = t.TypeVar('T')
+K = t.TypeVar('K')
+
+__all__ = [
+    'jaccard',
+    'WeightedMinHash',
+    'MinHashLSH',
+]
+
+_PRIME = (1 << 61) - 1
+_HASH_MASK = (1 << 61) - 1
+
+Signature = t.Tuple[int, ...]
+
+
+def jaccard(first: t.Iterable[T], second: t.Iterable[T]) -> float:
+    first = FrozenMultiset._as_multiset(first)
+    union = len(first.union(second))
+    if not union:
+        return 1.
+    return len(first.intersection(second)) / union
+
+
+class WeightedMinHash(object):
+    """
+    One permutation MinHash over multisets, where an element with multiplicity m contributes the m tokens
+    (element, 0) through (element, m - 1), so matching signature positions estimate the multiset jaccard
+    similarity |A & B| / |A | B|. Every token is hashed once and kept as the minimum of one of num_perm
+    bins, empty bins are filled from the next non-empty bin by rotation. Signatures use the builtin hash,
+    so they are only comparable within a single process.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self._num_perm = num_perm
+        self._a = rng.randrange(1, _PRIME)
+        self._b = rng.randrange(0, _PRIME)
+
+    @property
+    def num_perm(self) -> int:
+        return self._num_perm
+
+    def signature(self, multiset: t.Iterable[T]) -> Signature:
+        num_perm, a, b = self._num_perm, self._a, self._b
+        empty = _PRIME
+        bins = [empty] * num_perm
+
+        for element, multiplicity in BaseMultiset._as_mapping(multiset).items():
+            for copy in range(multiplicity):
+                value = (a * (hash((element, copy)) & _HASH_MASK) + b) % _PRIME
+                index = value % num_perm
+                value //= num_perm
+                if value < bins[index]:
+                    bins[index] = value
+
+        if all(value == empty for value in bins):
+            return tuple(bins)
+
+        signature = list(bins)
+        for index, value in enumerate(bins):
+            if value == empty:
+                offset = 1
+                while bins[(index + offset) % num_perm] == empty:
+                    offset += 1
+                signature[index] = bins[(index + offset) % num_perm] + offset * _PRIME
+        return tuple(signature)
+
+    @staticmethod
+    def estimate(first: Signature, second: Signature) -> float:
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class MinHashLSH(t.Generic[K, T]):
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self._hasher = WeightedMinHash(num_perm, seed)
+        self._rows = num_perm // bands
+        self._buckets: t.List[t.DefaultDict[Signature, t.Set[K]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: t.Dict[K, Signature] = {}
+        self._multisets: t.Dict[K, FrozenMultiset[T]] = {}
+
+    @property
+    def hasher(self) -> WeightedMinHash:
+        return self._hasher
+
+    def _bands(self, signature: Signature) -> t.Iterator[t.Tuple[t.DefaultDict[Signature, t.Set[K]], Signature]]:
+        rows = self._rows
+        for index, buckets in enumerate(self._buckets):
+            yield buckets, signature[index * rows:(index + 1) * rows]
+
+    def add(self, multiset: t.Iterable[T], key: t.Optional[K] = None) -> K:
+        if not isinstance(multiset, FrozenMultiset):
+            multiset = FrozenMultiset(multiset)
+        if key is None:
+            key = multiset
+        if key in self._multisets:
+            self.remove(key)
+
+        signature = self._hasher.signature(multiset)
+        self._signatures[key] = signature
+        self._multisets[key] = multiset
+        for buckets, band in self._bands(signature):
+            buckets[band].add(key)
+
+        return key
+
+    def remove(self, key: K) -> FrozenMultiset[T]:
+        signature = self._signatures.pop(key)
+        for buckets, band in self._bands(signature):
+            keys = buckets[band]
+            keys.discard(key)
+            if not keys:
+                del buckets[band]
+        return self._multisets.pop(key)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._multisets
+
+    def __getitem__(self, key: K) -> FrozenMultiset[T]:
+        return self._multisets[key]
+
+    def __len__(self) -> int:
+        return len(self._multisets)
+
+    def __iter__(self) -> t.Iterator[K]:
+        return iter(self._multisets)
+
+    def signature(self, key: K) -> Signature:
+        return self._signatures[key]
+
+    def candidates(self, probe: t.Iterable[T]) -> t.Set[K]:
+        result = set()
+        for buckets, band in self._bands(self._hasher.signature(probe)):
+            keys = buckets.get(band)
+            if keys:
+                result.update(keys)
+        return result
+
+    def query(
+        self,
+        probe: t.Iterable[T],
+        limit: t.Optional[int] = None,
+        threshold: float = 0.,
+    ) -> t.List[t.Tuple[K, float]]:
+        probe = FrozenMultiset._as_multiset(probe)
+        multisets = self._multisets
+        scored = (
+            (key, jaccard(probe, multisets[key]))
+            for key in
+            self.candidates(probe)
+        )
+        scored = [(key, similarity) for key, similarity in scored if similarity >= threshold]
+        if limit is not None:
+            return heapq.nlargest(limit, scored, key = lambda item: item[1])
+        return sorted(scored, key = lambda item: item[1], reverse = True)
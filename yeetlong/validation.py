@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import typing as t
+import functools
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+
+from yeetlong.errors import Errors
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'Validator',
+    'ValidatorTiming',
+    'ValidationRunner',
+]
+
+Validator = t.Callable[[T], Errors]
+
+
+class ValidatorTiming(t.NamedTuple):
+    calls: int
+    seconds: float
+
+
+def _timed(validator: Validator, value: T) -> t.Tuple[Errors, float]:
+    start = time.perf_counter()
+    errors = validator(value)
+    return errors, time.perf_counter() - start
+
+
+def _name(validator: Validator) -> str:
+    name = getattr(validator, '__name__', None)
+    if name is None and isinstance(validator, functools.partial):
+        name = getattr(validator.func, '__name__', None)
+    return repr(validator) if name is None else name
+
+
+def _unique_names(names: t.Iterable[str]) -> t.List[str]:
+    names = list(names)
+    taken = set(names)
+    used: t.Set[str] = set()
+    unique: t.List[str] = []
+    for name in names:
+        if name in used:
+            suffix = 2
+            while '{}#{}'.format(name, suffix) in taken:
+                suffix += 1
+            name = '{}#{}'.format(name, suffix)
+            taken.add(name)
+        used.add(name)
+        unique.append(name)
+    return unique
+
+
+class ValidationRunner(t.Generic[T]):
+    """
+    Runs every validator against every value on an executor. Validators are run and timed by position,
+    names are only used to label timings, validators without a distinct name get a #n suffix.
+    """
+
+    def __init__(
+        self,
+        validators: t.Union[t.Mapping[str, Validator], t.Iterable[Validator]],
+        executor: t.Optional[Executor] = None,
+        executor_class: t.Callable[..., Executor] = ThreadPoolExecutor,
+        max_workers: t.Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> None:
+        if isinstance(validators, t.Mapping):
+            self._names = list(validators.keys())
+            self._validators = list(validators.values())
+        else:
+            self._validators = list(validators)
+            self._names = _unique_names(map(_name, self._validators))
+        self._executor = executor
+        self._executor_class = executor_class
+        self._max_workers = max_workers
+        self._fail_fast = fail_fast
+        self._lock = threading.Lock()
+        self._calls = [0] * len(self._validators)
+        self._seconds = [0.] * len(self._validators)
+
+    @property
+    def timings(self) -> t.Mapping[str, ValidatorTiming]:
+        with self._lock:
+            return {
+                name: ValidatorTiming(calls, seconds)
+                for name, calls, seconds in
+                zip(self._names, self._calls, self._seconds)
+                if calls
+            }
+
+    def reset_timings(self) -> None:
+        with self._lock:
+            self._calls = [0] * len(self._validators)
+            self._seconds = [0.] * len(self._validators)
+
+    def _run(self, executor: Executor, values: t.Sequence[T]) -> t.List[t.Optional[Errors]]:
+        results: t.List[t.List[t.Optional[Errors]]] = [[None] * len(self._validators) for _ in values]
+        futures = {
+            executor.submit(_timed, validator, value): (index, position)
+            for index, value in enumerate(values)
+            for position, validator in enumerate(self._validators)
+        }
+        try:
+            for future in as_completed(futures):
+                index, position = futures[future]
+                errors, elapsed = future.result()
+                with self._lock:
+                    self._calls[position] += 1
+                    self._seconds[position] += elapsed
+                results[index][position] = errors
+                if self._fail_fast and not errors:
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return [
+            Errors.merge(
+                errors
+                for errors in
+                validator_results
+                if errors is not None
+            )
+            if all(errors is not None for errors in validator_results)
+            or any(errors is not None and not errors for errors in validator_results) else
+            None
+            for validator_results in
+            results
+        ]
+
+    def validate_many(self, values: t.Iterable[T]) -> t.List[t.Optional[Errors]]:
+        values = list(values)
+        if self._executor is not None:
+            return self._run(self._executor, values)
+        with self._executor_class(max_workers = self._max_workers) as executor:
+            return self._run(executor, values)
+
+    def validate(self, value: T) -> Errors:
+        return self.validate_many((value,))[0]
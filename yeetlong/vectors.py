@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import typing as t
+
+from yeetlong.counters import BaseCounter, FrozenCounter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+T = t.TypeVar('T')
+
+__all__ = [
+    'Vocabulary',
+    'CounterMatrix',
+    'dot_many',
+    'cosine_many',
+]
+
+
+class Vocabulary(t.Generic[T]):
+    """
+    Assigns every element a dense index, shared between CounterMatrix instances so their columns agree.
+    """
+
+    def __init__(self, elements: t.Iterable[T] = ()) -> None:
+        self._indices: t.Dict[T, int] = {}
+        self._elements: t.List[T] = []
+        for element in elements:
+            self.add(element)
+
+    def add(self, element: T) -> int:
+        index = self._indices.get(element)
+        if index is None:
+            index = self._indices[element] = len(self._elements)
+            self._elements.append(element)
+        return index
+
+    def index(self, element: T) -> t.Optional[int]:
+        return self._indices.get(element)
+
+    def __getitem__(self, index: int) -> T:
+        return self._elements[index]
+
+    def __contains__(self, element: T) -> bool:
+        return element in self._indices
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __iter__(self) -> t.Iterator[T]:
+        return iter(self._elements)
+
+
+class CounterMatrix(t.Generic[T]):
+    """
+    Many counters as rows of a sparse matrix, for comparing one query against all of them. With numpy the
+    rows are stored as flat index and value arrays over a Vocabulary and every query is answered with a
+    handful of vectorized operations, values are then floats. Without numpy it falls back to
+    BaseCounter.dot per row.
+    """
+
+    def __init__(
+        self,
+        counters: t.Iterable[t.Mapping[T, int]],
+        vocabulary: t.Optional[Vocabulary[T]] = None,
+    ) -> None:
+        self._counters: t.List[BaseCounter[T]] = [
+            counter if isinstance(counter, BaseCounter) else FrozenCounter(counter)
+            for counter in counters
+        ]
+        self._vocabulary = Vocabulary() if vocabulary is None else vocabulary
+
+        if numpy is None:
+            self._norms = [counter.norm() for counter in self._counters]
+            return
+
+        add = self._vocabulary.add
+        lengths = numpy.fromiter(map(len, self._counters), dtype = numpy.intp, count = len(self._counters))
+        size = int(lengths.sum())
+        self._indices = numpy.fromiter(
+            (add(element) for counter in self._counters for element in counter.distinct_elements()),
+            dtype = numpy.intp,
+            count = size,
+        )
+        self._values = numpy.fromiter(
+            (multiplicity for counter in self._counters for multiplicity in counter.multiplicities()),
+            dtype = numpy.float64,
+            count = size,
+        )
+        self._filled = numpy.flatnonzero(lengths)
+        self._starts = (numpy.cumsum(lengths) - lengths)[self._filled]
+        self._norms = self._row_sums(self._values * self._values) ** .5
+
+    @property
+    def vocabulary(self) -> Vocabulary[T]:
+        return self._vocabulary
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __getitem__(self, index: int) -> BaseCounter[T]:
+        return self._counters[index]
+
+    def _row_sums(self, products):
+        sums = numpy.zeros(len(self._counters))
+        if len(self._filled):
+            sums[self._filled] = numpy.add.reduceat(products, self._starts)
+        return sums
+
+    def _dots(self, query: BaseCounter[T]):
+        dense = numpy.zeros(len(self._vocabulary))
+        index = self._vocabulary.index
+        for element, multiplicity in query.items():
+            position = index(element)
+            if position is not None:
+                dense[position] = multiplicity
+        return self._row_sums(dense[self._indices] * self._values)
+
+    def dot(self, query: t.Mapping[T, int]) -> t.List[float]:
+        query = FrozenCounter._as_counter(query)
+        if numpy is None:
+            return [counter.dot(query) for counter in self._counters]
+        return self._dots(query).tolist()
+
+    def cosine(self, query: t.Mapping[T, int]) -> t.List[float]:
+        query = FrozenCounter._as_counter(query)
+        query_norm = query.norm()
+        if numpy is None:
+            return [
+                counter.dot(query) / (norm * query_norm) if norm and query_norm else 0.
+                for counter, norm in
+                zip(self._counters, self._norms)
+            ]
+        norms = self._norms * query_norm
+        dots = self._dots(query)
+        return numpy.divide(dots, norms, out = numpy.zeros_like(dots), where = norms != 0).tolist()
+
+
+def dot_many(
+    query: t.Mapping[T, int],
+    counters: t.Iterable[t.Mapping[T, int]],
+    vocabulary: t.Optional[Vocabulary[T]] = None,
+) -> t.List[float]:
+    return CounterMatrix(counters, vocabulary).dot(query)
+
+
+def cosine_many(
+    query: t.Mapping[T, int],
+    counters: t.Iterable[t.Mapping[T, int]],
+    vocabulary: t.Optional[Vocabulary[T]] = None,
+) -> t.List[float]:
+    return CounterMatrix(counters, vocabulary).cosine(query)